@@ -1,19 +1,186 @@
+import atexit
 import json
 import os
-import sys
+import re
+import shutil
 import sqlite3
-import requests
-from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any
 import threading
 import time
+from functools import cached_property, lru_cache
+
+# orjson 解析/序列化更快，不可用时回退到标准库 json
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 常用SQL语句
+_SQL_INSERT_HISTORY = '''
+                      INSERT INTO history (time, ip, type, country, province, city, isp, query_time)
+                      VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                      '''
+
+_SQL_INSERT_CLIPBOARD = '''
+                        INSERT INTO clipboard_history (time, content, contains_ip)
+                        VALUES (?, ?, ?)
+                        '''
+
+_SQL_SELECT_HISTORY = '''
+                      SELECT *
+                      FROM history
+                      ORDER BY time DESC
+                          LIMIT ?
+                      '''
+
+_SQL_SELECT_CLIPBOARD = '''
+                        SELECT *
+                        FROM clipboard_history
+                        ORDER BY time DESC
+                            LIMIT ?
+                        '''
+
+# 按主键倒序的游标分页，每页开销与已翻过的页数无关
+_SQL_HISTORY_FIRST_PAGE = '''
+                          SELECT *
+                          FROM history
+                          ORDER BY id DESC
+                              LIMIT ?
+                          '''
+
+_SQL_HISTORY_PAGE = '''
+                    SELECT *
+                    FROM history
+                    WHERE id < ?
+                    ORDER BY id DESC
+                        LIMIT ?
+                    '''
+
+_SQL_CLIPBOARD_FIRST_PAGE = '''
+                            SELECT *
+                            FROM clipboard_history
+                            ORDER BY id DESC
+                                LIMIT ?
+                            '''
+
+_SQL_CLIPBOARD_PAGE = '''
+                      SELECT *
+                      FROM clipboard_history
+                      WHERE id < ?
+                      ORDER BY id DESC
+                          LIMIT ?
+                      '''
+
+# 增量刷新：只取比已加载记录更新的行
+_SQL_HISTORY_SINCE = '''
+                     SELECT *
+                     FROM history
+                     WHERE id > ?
+                     ORDER BY id DESC
+                     '''
+
+_SQL_CLIPBOARD_SINCE = '''
+                       SELECT *
+                       FROM clipboard_history
+                       WHERE id > ?
+                       ORDER BY id DESC
+                       '''
+
+_SQL_SEARCH_HISTORY = '''
+                      SELECT *
+                      FROM history
+                      WHERE ip LIKE ?1
+                         OR country LIKE ?1
+                         OR province LIKE ?1
+                         OR city LIKE ?1
+                         OR isp LIKE ?1
+                      ORDER BY time DESC
+                          LIMIT 100
+                      '''
+
+_SQL_SEARCH_CLIPBOARD = '''
+                        SELECT *
+                        FROM clipboard_history
+                        WHERE content LIKE ?
+                        ORDER BY time DESC
+                            LIMIT 100
+                        '''
+
+# 旧版本创建的全文索引及同步触发器。搜索功能尚无界面调用，索引只会拖慢每次写入、
+# 使数据库成倍增大，启动时移除
+_OBSOLETE_FTS_OBJECTS = [
+    ('TRIGGER', 'history_ai'), ('TRIGGER', 'history_ad'), ('TRIGGER', 'history_au'),
+    ('TRIGGER', 'clipboard_ai'), ('TRIGGER', 'clipboard_ad'), ('TRIGGER', 'clipboard_au'),
+    ('TABLE', 'history_fts'), ('TABLE', 'clipboard_fts'),
+]
+
+# 各IP类型接口返回的地区/运营商字段名
+_DETAIL_KEYS = {
+    'ipv4': ('country_name', 'province_name', 'city_name', 'isp'),
+    'ipv6': ('country', 'province', 'city', 'isp'),
+}
+
+# 记录时间格式
+_FMT = '%Y-%m-%d %H:%M:%S'
+
+
+def _now() -> str:
+    """当前本地时间字符串"""
+    return time.strftime(_FMT)
+
+
+# 版本号：可选'v'前缀，缺失的次/修订号按0处理
+_VER_RE = re.compile(r'v?(\d+)(?:\.(\d+))?(?:\.(\d+))?')
+
+
+def parse_version(version_str: str) -> tuple:
+    """将版本号解析为可比较的三元组"""
+    m = _VER_RE.match(version_str.strip())
+    if not m:
+        return 0, 0, 0
+    return int(m[1]), int(m[2] or 0), int(m[3] or 0)
+
+
+@lru_cache(maxsize=None)
+def _ensure_data_dir():
+    """创建数据目录（每个进程只执行一次）"""
+    Path("data").mkdir(parents=True, exist_ok=True)
+
+
+@lru_cache(maxsize=1)
+def _get_install_dir():
+    """读取注册表中的安装目录（进程内只查询一次）"""
+    try:
+        import winreg
+        key = winreg.OpenKey(
+            winreg.HKEY_CURRENT_USER,
+            r"Software\Microsoft\Windows\CurrentVersion\Uninstall\Mingxin_Tools_剪贴板IP地理分析工具"
+        )
+        install_dir, _ = winreg.QueryValueEx(key, "InstallLocation")
+        winreg.CloseKey(key)
+        return install_dir
+    except:
+        return None
 
 
 class Config:
     """配置管理类"""
 
-    @property
+    # 未保存更改的写入间隔（秒）
+    FLUSH_INTERVAL = 1.0
+    # 更新检查结果缓存时长（秒）；手动强制检查时也复用较短时间内的结果
+    UPDATE_CACHE_TTL = 6 * 3600
+    FORCED_UPDATE_CACHE_TTL = 300
+
+    @cached_property
+    def version_tuple(self):
+        """当前版本号三元组"""
+        return parse_version(self.app_version)
+
+    @cached_property
     def install_info(self):
         """获取安装信息"""
         return {
@@ -26,22 +193,26 @@ class Config:
 
     def get_install_dir(self):
         """获取安装目录"""
-        try:
-            import winreg
-            key = winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER,
-                r"Software\Microsoft\Windows\CurrentVersion\Uninstall\Mingxin_Tools_剪贴板IP地理分析工具"
-            )
-            install_dir, _ = winreg.QueryValueEx(key, "InstallLocation")
-            winreg.CloseKey(key)
-            return install_dir
-        except:
-            return None
+        return _get_install_dir()
 
     def is_installed(self):
         """检查是否已安装"""
         return self.get_install_dir() is not None
 
+    @cached_property
+    def _session(self):
+        """复用HTTP连接（keep-alive），首次联网时才导入requests"""
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4,
+                              max_retries=Retry(total=2, backoff_factor=0.3))
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
     def __init__(self):
         self.app_name = "IP Analyzer"
         self.app_version = "1.0.0"
@@ -58,27 +229,42 @@ class Config:
             "notification_timeout": 10,  # 通知显示时间（秒）
             "auto_check_update": True,
             "last_update_check": "",
-            "api_status": "disconnected"
+            "api_status": "disconnected",
+            # 更新信息缓存（用于条件请求）
+            "last_etag": "",
+            "last_modified": "",
+            "last_update_info": {}
         }
 
+        # 延迟保存：update_config 只标记为脏，由后台线程合并写入
+        self._dirty = False
+        self._save_lock = threading.Lock()
+
+        # 更新检查结果的内存缓存
+        self._update_cache = None
+        self._update_cache_ts = 0
+
         # 创建数据目录
         self.create_data_directory()
 
         # 加载配置
         self.load_config()
 
+        # 后台定期写入，退出时写入未保存的更改
+        threading.Thread(target=self._flush_loop, daemon=True).start()
+        atexit.register(self._flush)
+
     def create_data_directory(self):
         """创建数据目录"""
-        data_dir = Path("data")
-        if not data_dir.exists():
-            data_dir.mkdir(parents=True)
+        _ensure_data_dir()
 
     def load_config(self):
         """加载配置文件"""
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    raw = f.read()
+                config_data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw.decode('utf-8'))
 
                 # 更新配置
                 for key, value in config_data.items():
@@ -108,19 +294,46 @@ class Config:
     def save_config(self):
         """保存配置文件"""
         try:
-            config_data = {}
-            for key in self.default_config.keys():
-                if hasattr(self, key):
-                    config_data[key] = getattr(self, key)
+            with self._save_lock:
+                self._dirty = False
+
+                config_data = {}
+                for key in self.default_config.keys():
+                    if hasattr(self, key):
+                        config_data[key] = getattr(self, key)
 
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=4, ensure_ascii=False)
+                # 先写临时文件再替换，避免写入中断导致配置文件损坏
+                tmp_file = self.config_file + ".tmp"
+                if ORJSON_AVAILABLE:
+                    with open(tmp_file, 'wb') as f:
+                        f.write(orjson.dumps(config_data, option=orjson.OPT_INDENT_2))
+                else:
+                    with open(tmp_file, 'w', encoding='utf-8') as f:
+                        json.dump(config_data, f, indent=4, ensure_ascii=False)
+                os.replace(tmp_file, self.config_file)
 
         except Exception as e:
             print(f"保存配置文件失败: {e}")
 
-    def check_for_updates(self) -> Optional[Dict[str, Any]]:
-        """检查更新"""
+    def _flush(self):
+        """如有未保存的更改则写入配置文件"""
+        if self._dirty:
+            self.save_config()
+
+    def _flush_loop(self):
+        """后台定期写入未保存的配置"""
+        while True:
+            time.sleep(self.FLUSH_INTERVAL)
+            self._flush()
+
+    def check_for_updates(self, force: bool = False) -> Optional[Dict[str, Any]]:
+        """检查更新，在缓存有效期内直接返回上次结果（强制检查时有效期更短）"""
+        ttl = self.FORCED_UPDATE_CACHE_TTL if force else self.UPDATE_CACHE_TTL
+        if self._update_cache is not None and time.monotonic() - self._update_cache_ts < ttl:
+            return self._update_cache
+
+        import requests
+
         try:
             # 使用正确的版本文件地址
             if self.api_base_url.startswith("https://ipv4.ink"):
@@ -131,22 +344,43 @@ class Config:
 
             print(f"正在检查更新，URL: {update_url}")
 
+            # 已有缓存时发送条件请求，未变化时服务器返回304且不带响应体
+            headers = {}
+            if self.last_update_info:
+                if self.last_etag:
+                    headers['If-None-Match'] = self.last_etag
+                if self.last_modified:
+                    headers['If-Modified-Since'] = self.last_modified
+
             # 发送请求，设置较短的超时时间
-            response = requests.get(update_url, timeout=15)
+            response = self._session.get(update_url, headers=headers, timeout=15)
 
             print(f"响应状态码: {response.status_code}")
 
+            if response.status_code == 304:
+                print("更新信息未变化，使用缓存")
+                return self._cache_update_result({
+                    "success": True,
+                    "data": self.last_update_info
+                })
+
             if response.status_code == 200:
                 update_info = response.json()
                 print(f"获取到的更新信息: {update_info}")
 
                 # 验证响应格式
                 if 'version' in update_info:
+                    # 缓存更新信息及校验头
+                    self.last_etag = response.headers.get('ETag', '')
+                    self.last_modified = response.headers.get('Last-Modified', '')
+                    self.last_update_info = update_info
+                    self._dirty = True
+
                     # 返回正确的格式
-                    return {
+                    return self._cache_update_result({
                         "success": True,
                         "data": update_info
-                    }
+                    })
                 else:
                     print("更新信息格式错误，缺少version字段")
                     return None
@@ -167,188 +401,255 @@ class Config:
             print(f"更新检查失败: {e}")
             return None
 
+    def _cache_update_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """记录成功的更新检查结果及时间"""
+        self._update_cache = result
+        self._update_cache_ts = time.monotonic()
+        return result
+
+    def check_for_updates_async(self, callback, force: bool = False):
+        """在后台线程检查更新，完成后以结果调用callback"""
+        threading.Thread(
+            target=lambda: callback(self.check_for_updates(force)),
+            daemon=True
+        ).start()
+
     def is_new_version_available(self, remote_version: str) -> bool:
         """检查是否有新版本"""
         try:
-            # 简单的版本号比较
-            def parse_version(version_str):
-                # 移除'v'前缀
-                if version_str.startswith('v'):
-                    version_str = version_str[1:]
-                # 分割版本号
-                parts = version_str.split('.')
-                # 确保有3部分
-                while len(parts) < 3:
-                    parts.append('0')
-                # 转换为整数
-                return [int(part) if part.isdigit() else 0 for part in parts]
-
-            current_parts = parse_version(self.app_version)
-            remote_parts = parse_version(remote_version)
-
-            # 比较版本号
-            for i in range(3):
-                if remote_parts[i] > current_parts[i]:
-                    return True
-                elif remote_parts[i] < current_parts[i]:
-                    return False
-
-            return False  # 版本相同
-
+            return parse_version(remote_version) > self.version_tuple
         except Exception as e:
             print(f"版本比较失败: {e}")
             return False
 
     def update_config(self, **kwargs):
-        """更新配置"""
+        """更新配置（延迟写入）"""
         for key, value in kwargs.items():
             if hasattr(self, key):
                 setattr(self, key, value)
 
-        # 保存配置
-        self.save_config()
+        # 标记为脏，由后台线程合并写入
+        self._dirty = True
 
 
 class DatabaseManager:
     """数据库管理类"""
 
+    # 定期执行 PRAGMA optimize 的间隔（秒）
+    OPTIMIZE_INTERVAL = 3 * 3600
+
     def __init__(self, db_path="data/ip_history.db"):
         self.db_path = db_path
 
+        # 所有线程共用一个连接，由锁保证串行访问
+        self._lock = threading.Lock()
+
         # 创建数据目录
         self.create_data_directory()
 
+        # 打开数据库连接
+        self.conn = self._connect()
+
         # 初始化数据库
         self.init_database()
 
+        # 后台定期优化查询计划
+        self._optimize_stop = threading.Event()
+        threading.Thread(target=self._optimize_loop, daemon=True).start()
+
     def create_data_directory(self):
         """创建数据目录"""
-        data_dir = Path("data")
-        if not data_dir.exists():
-            data_dir.mkdir(parents=True)
+        _ensure_data_dir()
+
+    def _connect(self):
+        """打开数据库连接"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+
+        # 性能参数，每个新连接都需要设置
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")  # 64MB 页缓存
+        conn.execute("PRAGMA mmap_size=268435456")  # 256MB 内存映射
+
+        # 行对象兼容元组下标，同时支持按列名访问
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _optimize_loop(self):
+        """定期执行 PRAGMA optimize"""
+        while not self._optimize_stop.wait(self.OPTIMIZE_INTERVAL):
+            try:
+                with self._lock:
+                    self.conn.execute("PRAGMA optimize")
+            except Exception as e:
+                print(f"数据库优化失败: {e}")
+
+    def close(self):
+        """关闭数据库连接"""
+        self._optimize_stop.set()
+        try:
+            with self._lock:
+                self.conn.execute("PRAGMA optimize")
+                self.conn.close()
+        except Exception as e:
+            print(f"关闭数据库失败: {e}")
 
     def init_database(self):
         """初始化数据库"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            # 创建历史记录表
-            cursor.execute('''
-                           CREATE TABLE IF NOT EXISTS history
-                           (
-                               id
-                               INTEGER
-                               PRIMARY
-                               KEY
-                               AUTOINCREMENT,
-                               time
-                               TEXT
-                               NOT
-                               NULL,
-                               ip
-                               TEXT
-                               NOT
-                               NULL,
-                               type
-                               TEXT
-                               NOT
-                               NULL,
-                               country
-                               TEXT,
-                               province
-                               TEXT,
-                               city
-                               TEXT,
-                               isp
-                               TEXT,
-                               query_time
-                               TEXT
-                           )
-                           ''')
-
-            # 创建剪贴板历史记录表
-            cursor.execute('''
-                           CREATE TABLE IF NOT EXISTS clipboard_history
-                           (
-                               id
-                               INTEGER
-                               PRIMARY
-                               KEY
-                               AUTOINCREMENT,
-                               time
-                               TEXT
-                               NOT
-                               NULL,
-                               content
-                               TEXT
-                               NOT
-                               NULL,
-                               contains_ip
-                               INTEGER
-                               DEFAULT
-                               0
-                           )
-                           ''')
-
-            # 创建索引以提高查询性能
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_time ON history(time)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ip ON history(ip)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_clipboard_time ON clipboard_history(time)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_clipboard_ip ON clipboard_history(contains_ip)')
-
-            conn.commit()
-            conn.close()
+            with self._lock, self.conn:
+                cursor = self.conn.cursor()
+
+                # 创建历史记录表
+                cursor.execute('''
+                               CREATE TABLE IF NOT EXISTS history
+                               (
+                                   id
+                                   INTEGER
+                                   PRIMARY
+                                   KEY
+                                   AUTOINCREMENT,
+                                   time
+                                   TEXT
+                                   NOT
+                                   NULL,
+                                   ip
+                                   TEXT
+                                   NOT
+                                   NULL,
+                                   type
+                                   TEXT
+                                   NOT
+                                   NULL,
+                                   country
+                                   TEXT,
+                                   province
+                                   TEXT,
+                                   city
+                                   TEXT,
+                                   isp
+                                   TEXT,
+                                   query_time
+                                   REAL
+                               )
+                               ''')
+
+                # 创建剪贴板历史记录表
+                cursor.execute('''
+                               CREATE TABLE IF NOT EXISTS clipboard_history
+                               (
+                                   id
+                                   INTEGER
+                                   PRIMARY
+                                   KEY
+                                   AUTOINCREMENT,
+                                   time
+                                   TEXT
+                                   NOT
+                                   NULL,
+                                   content
+                                   TEXT
+                                   NOT
+                                   NULL,
+                                   contains_ip
+                                   INTEGER
+                                   DEFAULT
+                                   0
+                               )
+                               ''')
+
+                # 旧版本把查询耗时存为文本，迁移为REAL
+                self._migrate_query_time(cursor)
+
+                # 创建索引以提高查询性能
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_history_ip_time'")
+                need_analyze = cursor.fetchone() is None
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_ip_time ON history(ip, time)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_time_desc ON history(time DESC)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_type ON history(type)')
+                # 单列索引已被上面的组合索引覆盖
+                cursor.execute('DROP INDEX IF EXISTS idx_ip')
+                cursor.execute('DROP INDEX IF EXISTS idx_time')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_clipboard_time ON clipboard_history(time)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_clipboard_ip ON clipboard_history(contains_ip)')
+
+                # 移除旧版本的全文索引
+                self._drop_fts(cursor)
+
+                # 新建索引后收集统计信息，让查询规划器使用它们
+                if need_analyze:
+                    cursor.execute('ANALYZE')
+
+            # 启动时优化查询计划（必要时分析表）
+            with self._lock:
+                self.conn.execute("PRAGMA optimize=0x10002")
 
             print("数据库初始化完成")
 
         except Exception as e:
             print(f"数据库初始化失败: {e}")
 
+    def _migrate_query_time(self, cursor):
+        """将 history.query_time 列从 TEXT 迁移为 REAL（仅执行一次）"""
+        cursor.execute("PRAGMA table_info(history)")
+        column_types = {row[1]: row[2].upper() for row in cursor.fetchall()}
+        if column_types.get('query_time') != 'TEXT':
+            return
+        # DROP COLUMN 需要 SQLite 3.35+，更旧的版本保持原结构
+        if sqlite3.sqlite_version_info < (3, 35, 0):
+            return
+
+        cursor.execute("ALTER TABLE history ADD COLUMN query_time_new REAL")
+        cursor.execute("UPDATE history SET query_time_new = CAST(query_time AS REAL) WHERE query_time IS NOT NULL")
+        cursor.execute("ALTER TABLE history DROP COLUMN query_time")
+        cursor.execute("ALTER TABLE history RENAME COLUMN query_time_new TO query_time")
+        print("已将查询耗时字段迁移为REAL类型")
+
+    def _drop_fts(self, cursor):
+        """删除旧版本创建的全文索引表和触发器"""
+        cursor.execute("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {(row[0].upper(), row[1]) for row in cursor.fetchall()}
+        try:
+            for kind, name in _OBSOLETE_FTS_OBJECTS:
+                if (kind, name) in existing:
+                    cursor.execute(f'DROP {kind} IF EXISTS {name}')
+        except sqlite3.OperationalError as e:
+            print(f"移除全文索引失败: {e}")
+
     def add_record(self, ip: str, ip_type: str, data: dict):
         """添加IP查询记录"""
+        return self.add_records([(ip, ip_type, data)])
+
+    def add_records(self, records):
+        """批量添加IP查询记录，records 为 (ip, ip_type, data) 列表，在同一事务中写入"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            # 解析数据
-            if ip_type == "ipv4":
-                if data.get('data'):
-                    detail = data['data']
-                    country = detail.get('country_name')
-                    province = detail.get('province_name')
-                    city = detail.get('city_name')
-                    isp = detail.get('isp')
-                    query_time = data.get('query_time_ms')
-                else:
-                    country = province = city = isp = query_time = None
-            else:
-                if data.get('data'):
-                    detail = data['data']
-                    country = detail.get('country')
-                    province = detail.get('province')
-                    city = detail.get('city')
-                    isp = detail.get('isp')
+            now = _now()
+            rows = []
+
+            for ip, ip_type, data in records:
+                # 解析数据，两种接口仅字段名不同
+                detail = data.get('data')
+                if detail:
+                    keys = _DETAIL_KEYS.get(ip_type, _DETAIL_KEYS['ipv6'])
+                    country, province, city, isp = (detail.get(key) for key in keys)
                     query_time = data.get('query_time_ms')
                 else:
                     country = province = city = isp = query_time = None
 
-            cursor.execute('''
-                           INSERT INTO history (time, ip, type, country, province, city, isp, query_time)
-                           VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                           ''', (
-                               datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                               ip,
-                               ip_type,
-                               country,
-                               province,
-                               city,
-                               isp,
-                               str(query_time) if query_time else None
-                           ))
-
-            conn.commit()
-            conn.close()
+                rows.append((
+                    now,
+                    ip,
+                    ip_type,
+                    country,
+                    province,
+                    city,
+                    isp,
+                    query_time
+                ))
+
+            with self._lock, self.conn:
+                self.conn.executemany(_SQL_INSERT_HISTORY, rows)
             return True
 
         except Exception as e:
@@ -358,33 +659,57 @@ class DatabaseManager:
     def get_history(self, limit=100):
         """获取历史记录"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self._lock:
+                cursor = self.conn.execute(_SQL_SELECT_HISTORY, (limit,))
+                return list(cursor)
 
-            cursor.execute('''
-                           SELECT *
-                           FROM history
-                           ORDER BY time DESC
-                               LIMIT ?
-                           ''', (limit,))
+        except Exception as e:
+            print(f"获取历史失败: {e}")
+            return []
 
-            history = cursor.fetchall()
-            conn.close()
-            return history
+    def get_history_page(self, before_id=None, limit=200):
+        """按id倒序获取一页历史记录，before_id 为上一页最后一条记录的id"""
+        try:
+            with self._lock:
+                if before_id is None:
+                    cursor = self.conn.execute(_SQL_HISTORY_FIRST_PAGE, (limit,))
+                else:
+                    cursor = self.conn.execute(_SQL_HISTORY_PAGE, (before_id, limit))
+                return list(cursor)
+
+        except Exception as e:
+            print(f"获取历史失败: {e}")
+            return []
+
+    def get_history_since(self, last_id):
+        """获取id大于 last_id 的历史记录（按id倒序）"""
+        try:
+            with self._lock:
+                return list(self.conn.execute(_SQL_HISTORY_SINCE, (last_id,)))
 
         except Exception as e:
             print(f"获取历史失败: {e}")
             return []
 
+    def iter_history(self, page_size=1000):
+        """按id倒序逐条产出全部历史记录，分页读取，不长时间占用连接"""
+        before_id = None
+        while True:
+            page = self.get_history_page(before_id, page_size)
+            yield from page
+            if len(page) < page_size:
+                return
+            before_id = page[-1]["id"]
+
+    def _clear_table(self, table):
+        """在单个事务中清空表"""
+        with self._lock, self.conn:
+            self.conn.execute(f'DELETE FROM {table}')
+
     def clear_history(self):
         """清空历史记录"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('DELETE FROM history')
-            conn.commit()
-            conn.close()
+            self._clear_table('history')
             return True
 
         except Exception as e:
@@ -394,12 +719,8 @@ class DatabaseManager:
     def delete_record_by_ip_and_time(self, ip, time_str):
         """根据IP和时间删除记录"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('DELETE FROM history WHERE ip = ? AND time = ?', (ip, time_str))
-            conn.commit()
-            conn.close()
+            with self._lock, self.conn:
+                cursor = self.conn.execute('DELETE FROM history WHERE ip = ? AND time = ?', (ip, time_str))
             return cursor.rowcount > 0
 
         except Exception as e:
@@ -408,21 +729,16 @@ class DatabaseManager:
 
     def add_clipboard_record(self, content, contains_ip):
         """添加剪贴板记录"""
+        return self.add_clipboard_records([(content, contains_ip)])
+
+    def add_clipboard_records(self, records):
+        """批量添加剪贴板记录，records 为 (content, contains_ip) 列表，在同一事务中写入"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('''
-                           INSERT INTO clipboard_history (time, content, contains_ip)
-                           VALUES (?, ?, ?)
-                           ''', (
-                               datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                               content,
-                               1 if contains_ip else 0
-                           ))
-
-            conn.commit()
-            conn.close()
+            now = _now()
+            rows = [(now, content, 1 if contains_ip else 0) for content, contains_ip in records]
+
+            with self._lock, self.conn:
+                self.conn.executemany(_SQL_INSERT_CLIPBOARD, rows)
             return True
 
         except Exception as e:
@@ -432,33 +748,52 @@ class DatabaseManager:
     def get_clipboard_history(self, limit=100):
         """获取剪贴板历史记录"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self._lock:
+                cursor = self.conn.execute(_SQL_SELECT_CLIPBOARD, (limit,))
+                return list(cursor)
+
+        except Exception as e:
+            print(f"获取剪贴板历史失败: {e}")
+            return []
+
+    def get_clipboard_history_page(self, before_id=None, limit=200):
+        """按id倒序获取一页剪贴板历史记录，before_id 为上一页最后一条记录的id"""
+        try:
+            with self._lock:
+                if before_id is None:
+                    cursor = self.conn.execute(_SQL_CLIPBOARD_FIRST_PAGE, (limit,))
+                else:
+                    cursor = self.conn.execute(_SQL_CLIPBOARD_PAGE, (before_id, limit))
+                return list(cursor)
 
-            cursor.execute('''
-                           SELECT *
-                           FROM clipboard_history
-                           ORDER BY time DESC
-                               LIMIT ?
-                           ''', (limit,))
+        except Exception as e:
+            print(f"获取剪贴板历史失败: {e}")
+            return []
 
-            history = cursor.fetchall()
-            conn.close()
-            return history
+    def get_clipboard_history_since(self, last_id):
+        """获取id大于 last_id 的剪贴板历史记录（按id倒序）"""
+        try:
+            with self._lock:
+                return list(self.conn.execute(_SQL_CLIPBOARD_SINCE, (last_id,)))
 
         except Exception as e:
             print(f"获取剪贴板历史失败: {e}")
             return []
 
+    def iter_clipboard_history(self, page_size=1000):
+        """按id倒序逐条产出全部剪贴板历史记录，分页读取，不长时间占用连接"""
+        before_id = None
+        while True:
+            page = self.get_clipboard_history_page(before_id, page_size)
+            yield from page
+            if len(page) < page_size:
+                return
+            before_id = page[-1]["id"]
+
     def clear_clipboard_history(self):
         """清空剪贴板历史记录"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('DELETE FROM clipboard_history')
-            conn.commit()
-            conn.close()
+            self._clear_table('clipboard_history')
             return True
 
         except Exception as e:
@@ -468,12 +803,8 @@ class DatabaseManager:
     def delete_clipboard_record_by_time(self, time_str):
         """根据时间删除剪贴板记录"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('DELETE FROM clipboard_history WHERE time = ?', (time_str,))
-            conn.commit()
-            conn.close()
+            with self._lock, self.conn:
+                cursor = self.conn.execute('DELETE FROM clipboard_history WHERE time = ?', (time_str,))
             return cursor.rowcount > 0
 
         except Exception as e:
@@ -483,30 +814,9 @@ class DatabaseManager:
     def search_history(self, keyword: str):
         """搜索历史记录"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('''
-                           SELECT *
-                           FROM history
-                           WHERE ip LIKE ?
-                              OR country LIKE ?
-                              OR province LIKE ?
-                              OR city LIKE ?
-                              OR isp LIKE ?
-                           ORDER BY time DESC
-                               LIMIT 100
-                           ''', (
-                               f'%{keyword}%',
-                               f'%{keyword}%',
-                               f'%{keyword}%',
-                               f'%{keyword}%',
-                               f'%{keyword}%'
-                           ))
-
-            history = cursor.fetchall()
-            conn.close()
-            return history
+            with self._lock:
+                cursor = self.conn.execute(_SQL_SEARCH_HISTORY, (f'%{keyword}%',))
+                return list(cursor)
 
         except Exception as e:
             print(f"搜索历史失败: {e}")
@@ -515,20 +825,9 @@ class DatabaseManager:
     def search_clipboard_history(self, keyword: str):
         """搜索剪贴板历史记录"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('''
-                           SELECT *
-                           FROM clipboard_history
-                           WHERE content LIKE ?
-                           ORDER BY time DESC
-                               LIMIT 100
-                           ''', (f'%{keyword}%',))
-
-            history = cursor.fetchall()
-            conn.close()
-            return history
+            with self._lock:
+                cursor = self.conn.execute(_SQL_SEARCH_CLIPBOARD, (f'%{keyword}%',))
+                return list(cursor)
 
         except Exception as e:
             print(f"搜索剪贴板历史失败: {e}")
@@ -537,40 +836,38 @@ class DatabaseManager:
     def get_statistics(self):
         """获取统计信息"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            # 总记录数
-            cursor.execute('SELECT COUNT(*) FROM history')
-            total_records = cursor.fetchone()[0]
-
-            # IP类型统计
-            cursor.execute('SELECT type, COUNT(*) FROM history GROUP BY type')
-            type_stats = cursor.fetchall()
-
-            # 最近7天记录数
-            cursor.execute('''
-                           SELECT DATE (time), COUNT (*)
-                           FROM history
-                           WHERE time >= datetime('now', '-7 days')
-                           GROUP BY DATE (time)
-                           ORDER BY DATE (time)
-                           ''')
-            weekly_stats = cursor.fetchall()
-
-            # 剪贴板记录统计
-            cursor.execute('SELECT COUNT(*) FROM clipboard_history')
-            total_clipboard = cursor.fetchone()[0]
-
-            cursor.execute('SELECT COUNT(*) FROM clipboard_history WHERE contains_ip = 1')
-            clipboard_with_ip = cursor.fetchone()[0]
-
-            conn.close()
+            with self._lock:
+                cursor = self.conn.cursor()
+
+                # 总记录数
+                cursor.execute('SELECT COUNT(*) FROM history')
+                total_records = cursor.fetchone()[0]
+
+                # IP类型统计
+                cursor.execute('SELECT type, COUNT(*) FROM history GROUP BY type')
+                type_stats = cursor.fetchall()
+
+                # 最近7天记录数
+                cursor.execute('''
+                               SELECT DATE (time), COUNT (*)
+                               FROM history
+                               WHERE time >= datetime('now', '-7 days')
+                               GROUP BY DATE (time)
+                               ORDER BY DATE (time)
+                               ''')
+                weekly_stats = cursor.fetchall()
+
+                # 剪贴板记录统计
+                cursor.execute('SELECT COUNT(*) FROM clipboard_history')
+                total_clipboard = cursor.fetchone()[0]
+
+                cursor.execute('SELECT COUNT(*) FROM clipboard_history WHERE contains_ip = 1')
+                clipboard_with_ip = cursor.fetchone()[0]
 
             return {
                 "total_records": total_records,
                 "type_stats": dict(type_stats),
-                "weekly_stats": weekly_stats,
+                "weekly_stats": [tuple(row) for row in weekly_stats],
                 "total_clipboard": total_clipboard,
                 "clipboard_with_ip": clipboard_with_ip
             }
@@ -582,8 +879,13 @@ class DatabaseManager:
     def backup_database(self, backup_path: str):
         """备份数据库"""
         try:
-            import shutil
-            shutil.copy2(self.db_path, backup_path)
+            # 使用SQLite在线备份接口逐页复制，无需先回写WAL
+            target = sqlite3.connect(backup_path)
+            try:
+                with self._lock:
+                    self.conn.backup(target)
+            finally:
+                target.close()
             return True
         except Exception as e:
             print(f"备份数据库失败: {e}")
@@ -592,9 +894,17 @@ class DatabaseManager:
     def restore_database(self, backup_path: str):
         """恢复数据库"""
         try:
-            import shutil
             if os.path.exists(backup_path):
-                shutil.copy2(backup_path, self.db_path)
+                # 直接把备份库的页复制到当前连接，无需关闭重连
+                source = sqlite3.connect(backup_path)
+                try:
+                    with self._lock:
+                        source.backup(self.conn)
+                finally:
+                    source.close()
+
+                # 备份可能来自旧版本，补齐表结构
+                self.init_database()
                 return True
             return False
         except Exception as e:
@@ -611,6 +921,7 @@ class AutoUpdater:
         self.download_url = "https://ipv4.ink/win/downloads/"
         self.update_available = False
         self.update_info = {}
+        self.downloaded_file = None
 
     def check_update(self):
         """检查更新"""
@@ -643,14 +954,32 @@ class AutoUpdater:
 
             download_url = self.update_info.get('download_url', self.download_url)
 
-            # 这里应该实现实际的下载逻辑
-            # 由于安全考虑，这里只返回模拟结果
-            if progress_callback:
-                # 模拟下载进度
-                for i in range(0, 101, 10):
-                    time.sleep(0.1)
-                    progress_callback(i)
-
+            update_dir = Path("data") / "updates"
+            update_dir.mkdir(parents=True, exist_ok=True)
+            file_name = os.path.basename(download_url.split('?', 1)[0]) or "update.exe"
+            target = update_dir / file_name
+            part_file = target.with_name(target.name + ".part")
+
+            # 流式下载，边接收边写盘，内存占用与安装包大小无关
+            with self.config._session.get(download_url, stream=True, timeout=60) as response:
+                response.raise_for_status()
+                total = int(response.headers.get('Content-Length', 0))
+
+                with open(part_file, 'wb') as f:
+                    if progress_callback is None:
+                        response.raw.decode_content = True
+                        shutil.copyfileobj(response.raw, f, length=1 << 20)
+                    else:
+                        done = 0
+                        for chunk in response.iter_content(chunk_size=65536):
+                            f.write(chunk)
+                            done += len(chunk)
+                            if total:
+                                progress_callback(min(done * 100 // total, 100))
+                        progress_callback(100)
+
+            os.replace(part_file, target)
+            self.downloaded_file = str(target)
             return True, "下载完成"
 
         except Exception as e:
@@ -1,79 +1,308 @@
 import sys
 import re
+import socket
 import threading
+import queue
 import time
+import importlib.util
 import webbrowser
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional, List, Tuple, Dict
+from functools import partial
+from typing import Optional, List, Tuple, Dict, Iterator
 import json
+import csv
+import logging
 import traceback
-import sqlite3
 from pathlib import Path
 import os
 
-import pyperclip
-import requests
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
-                             QHBoxLayout, QLabel, QPushButton, QTextEdit,
-                             QSystemTrayIcon, QMenu, QMessageBox, QTableWidget,
-                             QTableWidgetItem, QTabWidget, QSplitter,
+                             QHBoxLayout, QLabel, QPushButton, QTextEdit, QPlainTextEdit,
+                             QSystemTrayIcon, QMenu, QMessageBox, QTabWidget, QSplitter,
                              QHeaderView, QAbstractItemView, QDialog,
                              QFormLayout, QLineEdit, QCheckBox, QDoubleSpinBox,
-                             QFileDialog, QMenu, QTextBrowser, QDialogButtonBox)
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QObject, QSize, QThread, pyqtSignal
+                             QFileDialog, QMenu, QTextBrowser, QDialogButtonBox,
+                             QTableView, QStyledItemDelegate, QStyleOptionButton, QStyle)
+from PyQt6.QtCore import (Qt, QTimer, pyqtSignal, QObject, QSize, QThread, pyqtSignal,
+                          QAbstractTableModel, QModelIndex, QEvent, QRect, QMutex, QWaitCondition,
+                          QRunnable, QThreadPool)
 from PyQt6.QtGui import QIcon, QAction, QFont, QPixmap, QPainter, QColor, QBrush
-from plyer import notification
 
-# 修复 win10toast 导入警告
-import warnings
+# orjson 序列化更快，不可用时回退到标准库 json
+try:
+    import orjson
 
-warnings.filterwarnings("ignore", message="pkg_resources is deprecated")
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
+# re2 匹配时间与输入长度成线性关系，用于IPv6扫描；不可用时回退到标准库 re
 try:
-    import win10toast
+    import re2
 
-    WIN10TOAST_AVAILABLE = True
+    RE2_AVAILABLE = True
 except ImportError:
-    WIN10TOAST_AVAILABLE = False
-    print("win10toast 不可用，将使用其他通知方式")
+    RE2_AVAILABLE = False
+
+# 修复 win10toast 导入警告
+import warnings
+
+warnings.filterwarnings("ignore", message="pkg_resources is deprecated")
 
 from config import Config, DatabaseManager
 
+# 通知日志默认不输出，启动时加 --verbose 参数可在控制台查看
+logger = logging.getLogger("ipanalyzer.notification")
+logger.addHandler(logging.NullHandler())
+
+# 全局样式表，启动时安装到 QApplication 上只解析一次，控件通过 objectName 匹配
+APP_STYLE_SHEET = """
+QLabel#titleLabel { color: #2c3e50; }
+QWidget#separator { background-color: #ddd; }
+QTextEdit#infoText, QPlainTextEdit#infoText {
+    border: 1px solid #ddd;
+    border-radius: 4px;
+    padding: 5px;
+    background-color: #f8f9fa;
+}
+QPushButton#smallBtn { padding: 2px 8px; font-size: 11px; }
+QPushButton#exitBtn { background-color: #e74c3c; color: white; }
+QPushButton#dangerBtn { background-color: #ff4444; color: white; }
+QPushButton#checkUpdateBtn { background-color: #3498db; color: white; padding: 5px; }
+QPushButton#saveBtn { background-color: #27ae60; color: white; padding: 8px; }
+QPushButton#cancelBtn { padding: 8px; }
+"""
+
+# 超过该长度（字符）的剪贴板内容不做IP扫描
+MAX_CLIPBOARD_SCAN = 256 * 1024
+
+# IP地址正则表达式，模块加载时编译一次
+# IPv4 - 支持中文字符前后的IP
+# 每段限定为 0-255 且不带前导零，匹配结果即为合法IPv4，无需再逐段校验
+# （re2 不支持 (?!0\d) 这类前瞻，因此直接在分支中排除前导零）
+_IPV4_PATTERN = (
+    r'(?:(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])\.){3}(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])'
+)
+# IPv6 各分支由同一个十六进制段子模式组合而成
+_HEX16 = r'[A-Fa-f0-9]{1,4}'
+_IPV6_PATTERN = (
+    rf'(?:{_HEX16}:){{7}}{_HEX16}|'                              # 完整的8段
+    rf'(?:{_HEX16}:){{1,6}}:(?:{_HEX16}:){{0,5}}{_HEX16}|'       # 中间压缩
+    rf'{_HEX16}::(?:{_HEX16}:){{0,5}}{_HEX16}|'                  # 第一段后压缩
+    rf'::(?:{_HEX16}:){{0,6}}{_HEX16}|'                          # 开头压缩
+    rf'(?:{_HEX16}:){{1,7}}:'                                    # 末尾压缩
+)
+# IPv6 的多分支模式在 re 中可能大量回溯，re2 可用时改用 re2（忽略大小写用内联 (?i)，两者都支持）
+# 所有分组均为非捕获分组；re 回退时加 re.ASCII，省去 Unicode 大小写折叠
+if RE2_AVAILABLE:
+    _IPV4_RE = re2.compile(_IPV4_PATTERN)
+    _IPV6_RE = re2.compile(rf'(?i){_IPV6_PATTERN}')
+else:
+    _IPV4_RE = re.compile(_IPV4_PATTERN, re.ASCII)
+    _IPV6_RE = re.compile(rf'(?i){_IPV6_PATTERN}', re.ASCII)
+
+
+def is_valid_ipv6(ip: str) -> bool:
+    """验证IPv6地址有效性（由 inet_pton 解析）"""
+    try:
+        socket.inet_pton(socket.AF_INET6, ip)
+        return True
+    except OSError:
+        return False
+
+
+def iter_ips(text: str, enable_ipv4: bool = True, enable_ipv6: bool = True) -> Iterator[Tuple[str, str]]:
+    """逐个产出文本中的IP地址（先IPv4后IPv6，各自按出现顺序），调用方可提前停止"""
+    if len(text) > MAX_CLIPBOARD_SCAN:
+        return
+
+    # 查找IPv4（不含 '.' 的文本不可能有IPv4，跳过正则）
+    if enable_ipv4 and '.' in text:
+        for match in _IPV4_RE.finditer(text):
+            # 正则已保证地址合法；检查前后字符，确保不是更大的数字的一部分
+            start_pos, end_pos = match.span()
+            if start_pos > 0 and text[start_pos - 1].isdigit():
+                continue  # 前一个字符是数字，可能是更大的数字的一部分
+            if end_pos < len(text) and text[end_pos].isdigit():
+                continue  # 后一个字符是数字，可能是更大的数字的一部分
+
+            yield match.group(), "ipv4"
+
+    # 查找IPv6（不含 ':' 的文本不可能有IPv6）
+    if enable_ipv6 and ':' in text:
+        for match in _IPV6_RE.finditer(text):
+            ip = match.group()
+            if is_valid_ipv6(ip):
+                yield ip, "ipv6"
+
+
 class APIChecker(QThread):
-    """API检查线程"""
+    """后台网络线程：定期检查API连接，并按需执行更新检查"""
     status_updated = pyqtSignal(str, str)  # (status, message)
+    update_available = pyqtSignal(dict)  # 传递更新信息
+    check_completed = pyqtSignal(bool, str)  # (是否有更新, 消息)
 
-    def __init__(self):
+    # API检查间隔（秒）；连续失败时指数退避，最长不超过 MAX_CHECK_INTERVAL
+    CHECK_INTERVAL = 30
+    MAX_CHECK_INTERVAL = 600
+
+    def __init__(self, config=None):
         super().__init__()
+        self.config = config
         self.api_url = "https://ipv4.ink"
         self.running = True
+        # requests 在线程启动后再导入，不拖慢程序启动
+        self._requests = None
+        self.session = None
+        # 优先使用HEAD请求，服务器不支持时回退到GET
+        self.method = "HEAD"
+        self._failures = 0  # 连续检查失败次数
+
+        # 检查间隔的等待可被 stop() 或更新检查请求立即唤醒
+        self._mutex = QMutex()
+        self._wake = QWaitCondition()
+        self._update_request = None  # None 表示没有待处理的更新检查，否则为 force 参数
+
+    def _create_session(self):
+        """导入requests并创建复用连接（keep-alive）的会话"""
+        import requests
+
+        self._requests = requests
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": "IPAnalyzer/1.0"})
+        adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def run(self):
+        self._create_session()
+        next_check = 0.0
         while self.running:
-            try:
-                # 测试连接API
-                response = requests.get(f"{self.api_url}/", timeout=5)
+            # 处理待执行的更新检查
+            self._mutex.lock()
+            force, self._update_request = self._update_request, None
+            self._mutex.unlock()
+            if force is not None:
+                self._check_update(force)
+
+            if time.monotonic() >= next_check:
+                self._failures = 0 if self._check_api() else self._failures + 1
+                next_check = time.monotonic() + self._next_interval()
+
+            # 等待到下次检查，期间可被唤醒
+            self._mutex.lock()
+            if self.running and self._update_request is None:
+                remaining = max(0, int((next_check - time.monotonic()) * 1000))
+                self._wake.wait(self._mutex, remaining)
+            self._mutex.unlock()
+
+        self.session.close()
+
+    def _next_interval(self):
+        """根据连续失败次数计算下次检查间隔（秒）"""
+        if not self._failures:
+            return self.CHECK_INTERVAL
+        return min(self.CHECK_INTERVAL * 2 ** min(self._failures, 5), self.MAX_CHECK_INTERVAL)
+
+    def _check_api(self):
+        """测试API连接，返回是否连接正常"""
+        try:
+            response = self.session.request(self.method, f"{self.api_url}/", timeout=5)
+            if response.status_code in (405, 501) and self.method == "HEAD":
+                self.method = "GET"
+                response = self.session.get(f"{self.api_url}/", timeout=5)
 
-                if response.status_code == 200:
-                    self.status_updated.emit("connected", "API连接正常")
-                else:
-                    self.status_updated.emit("disconnected", f"API响应异常: {response.status_code}")
+            if response.status_code == 200:
+                self.status_updated.emit("connected", "API连接正常")
+                return True
+            self.status_updated.emit("disconnected", f"API响应异常: {response.status_code}")
 
-            except requests.exceptions.ConnectionError:
-                self.status_updated.emit("disconnected", "网络连接失败")
-            except requests.exceptions.Timeout:
-                self.status_updated.emit("disconnected", "连接超时")
-            except Exception as e:
-                self.status_updated.emit("disconnected", f"连接错误: {str(e)}")
+        except self._requests.exceptions.ConnectionError:
+            self.status_updated.emit("disconnected", "网络连接失败")
+        except self._requests.exceptions.Timeout:
+            self.status_updated.emit("disconnected", "连接超时")
+        except Exception as e:
+            self.status_updated.emit("disconnected", f"连接错误: {str(e)}")
+        return False
+
+    def request_update_check(self, force=False):
+        """请求在本线程中执行一次更新检查"""
+        self._mutex.lock()
+        self._update_request = force or bool(self._update_request)
+        self._wake.wakeAll()
+        self._mutex.unlock()
+
+    def _check_update(self, force):
+        """检查更新"""
+        try:
+            print("正在检查更新...")
+            remote_info = self.config.check_for_updates(force=force)
+            print(f"获取到的更新信息: {remote_info}")
 
-            # 每30秒检查一次
-            for _ in range(30):
-                if not self.running:
-                    break
-                time.sleep(1)
+            if remote_info and remote_info.get('success'):
+                data = remote_info.get('data', {})
+                remote_version = data.get('version')
+
+                if remote_version:
+                    print(f"远程版本: {remote_version}, 本地版本: {self.config.app_version}")
+
+                    if self.config.is_new_version_available(remote_version):
+                        print(f"发现新版本: {remote_version}")
+                        self.update_available.emit(data)
+                        self.check_completed.emit(True, f"发现新版本 {remote_version}")
+                    else:
+                        print("当前已是最新版本")
+                        self.check_completed.emit(False, "当前已是最新版本")
+                else:
+                    print("更新信息中缺少版本号")
+                    self.check_completed.emit(False, "检查更新失败：版本信息不完整")
+            else:
+                print("检查更新失败或无更新信息")
+                self.check_completed.emit(False, "检查更新失败或网络错误")
+
+        except Exception as e:
+            print(f"检查更新异常: {e}")
+            self.check_completed.emit(False, f"检查更新失败: {str(e)}")
 
     def stop(self):
+        self._mutex.lock()
         self.running = False
+        self._wake.wakeAll()
+        self._mutex.unlock()
+
+
+class ClipboardScanner(QThread):
+    """后台扫描线程：从剪贴板文本中查找IP并写入剪贴板历史，不阻塞界面"""
+    scanned = pyqtSignal(str, bool, object)  # (剪贴板内容, 是否包含IP, 新的 (ip, 类型) 或 None)
+    scan_failed = pyqtSignal(str)  # 错误信息，由界面线程写入日志
+
+    def __init__(self, window):
+        super().__init__()
+        self.window = window
+        self.db_manager = window.db_manager
+        # 不限长度：剪贴板变化由用户操作产生，每条都要写入剪贴板历史
+        self.queue = queue.Queue()
+
+    def submit(self, content):
+        """提交待扫描的文本"""
+        self.queue.put(content)
+
+    def run(self):
+        while True:
+            content = self.queue.get()
+            if content is None:
+                break
+            try:
+                # 只需要第一个与当前IP不同的地址，找到即停止扫描
+                contains_ip, new_ip = self.window.find_first_ip(content, self.window.current_ip)
+                self.db_manager.add_clipboard_record(content, contains_ip)
+                self.scanned.emit(content, contains_ip, new_ip)
+            except Exception as e:
+                self.scan_failed.emit(str(e))
+
+    def stop(self):
+        self.submit(None)
 
 
 class DetailDialog(QDialog):
@@ -99,13 +328,317 @@ class DetailDialog(QDialog):
         layout.addWidget(self.text_browser)
         layout.addWidget(button_box)
 
+    def set_content(self, title, content):
+        """更新标题和内容，便于复用同一个对话框"""
+        self.setWindowTitle(title)
+        self.text_browser.setPlainText(content)
+
+
+# 详情对话框最多显示的内容字符数，超出部分截断
+MAX_DETAIL_CHARS = 65536
+
+
+def truncate_for_display(content):
+    """截断过长的内容，只用于显示"""
+    if len(content) <= MAX_DETAIL_CHARS:
+        return content
+    return content[:MAX_DETAIL_CHARS] + f"\n[... 已截断 {len(content) - MAX_DETAIL_CHARS} 个字符 ...]"
+
+
+def show_detail_dialog(parent, title, content):
+    """显示详细信息对话框，每个父窗口只创建一次并重复使用"""
+    dialog = getattr(parent, "_detail_dialog", None)
+    if dialog is None:
+        dialog = parent._detail_dialog = DetailDialog(title, content, parent)
+    else:
+        dialog.set_content(title, content)
+    dialog.exec()
+
+
+def write_json_array(file_path, items):
+    """将可迭代对象逐条写成JSON数组文件，不在内存中构建完整列表"""
+    # orjson 直接输出UTF-8字节，不可用时回退到标准库 json
+    if ORJSON_AVAILABLE:
+        dumps = orjson.dumps
+    else:
+        dumps = lambda item: json.dumps(item, ensure_ascii=False).encode('utf-8')
+
+    with open(file_path, 'wb') as f:
+        f.write(b"[")
+        for i, item in enumerate(items):
+            f.write(b",\n  " if i else b"\n  ")
+            f.write(dumps(item))
+        f.write(b"\n]\n")
+
+
+# 导出格式：(JSON条目, CSV表头, CSV行)
+HISTORY_EXPORT_FORMAT = (
+    lambda record: {
+        "time": record["time"],
+        "ip": record["ip"],
+        "type": record["type"],
+        "country": record["country"],
+        "province": record["province"],
+        "city": record["city"],
+        "isp": record["isp"],
+        "query_time": record["query_time"]
+    },
+    ['时间', 'IP地址', '类型', '国家', '省份', '城市', '运营商', '查询耗时(ms)'],
+    lambda record: [
+        record["time"],  # 时间
+        record["ip"],  # IP地址
+        record["type"],  # 类型
+        record["country"] if record["country"] else "未知",  # 国家
+        record["province"] if record["province"] else "未知",  # 省份
+        record["city"] if record["city"] else "未知",  # 城市
+        record["isp"] if record["isp"] else "未知",  # 运营商
+        record["query_time"] if record["query_time"] else ""  # 查询耗时
+    ]
+)
+
+CLIPBOARD_EXPORT_FORMAT = (
+    lambda record: {
+        "time": record["time"],
+        "content": record["content"],
+        "contains_ip": bool(record["contains_ip"])
+    },
+    ['时间', '内容', '包含IP'],
+    lambda record: [
+        record["time"],  # 时间
+        record["content"],  # 内容
+        "是" if record["contains_ip"] else "否"  # 包含IP
+    ]
+)
+
+
+class ExportWorker(QThread):
+    """导出线程，从数据库逐条读取记录写入文件（.csv 为CSV，其余为JSON）"""
+    progress = pyqtSignal(int)  # 已导出记录数
+    export_finished = pyqtSignal(bool, str)  # (是否成功, 文件路径或错误信息)
+
+    def __init__(self, records, file_path, export_format, parent=None):
+        super().__init__(parent)
+        self.records = records
+        self.file_path = file_path
+        self.export_format = export_format
+
+    def run(self):
+        json_item, csv_header, csv_row = self.export_format
+        try:
+            if self.file_path.lower().endswith('.csv'):
+                with open(self.file_path, 'w', newline='', encoding='utf-8-sig') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(csv_header)
+                    writer.writerows(csv_row(record) for record in self._counted())
+            else:
+                write_json_array(self.file_path, (json_item(record) for record in self._counted()))
+            self.export_finished.emit(True, self.file_path)
+        except Exception as e:
+            self.export_finished.emit(False, str(e))
+
+    def _counted(self):
+        """逐条产出记录，每1000条报告一次进度"""
+        count = 0
+        for count, record in enumerate(self.records, 1):
+            yield record
+            if count % 1000 == 0:
+                self.progress.emit(count)
+        self.progress.emit(count)
+
+
+def start_export(parent, button, records, file_path, export_format, on_finished):
+    """启动后台导出，导出期间禁用按钮并在按钮上显示进度"""
+    worker = ExportWorker(records, file_path, export_format, parent)
+    text = button.text()
+    button.setEnabled(False)
+    worker.progress.connect(lambda count: button.setText(f"导出中({count})"))
+
+    def finished(success, message):
+        button.setEnabled(True)
+        button.setText(text)
+        on_finished(success, message)
+
+    worker.export_finished.connect(finished)
+    worker.finished.connect(worker.deleteLater)
+    worker.start()
+    return worker
+
+
+class RecordTableModel(QAbstractTableModel):
+    """数据库记录表格模型，只在视图需要时生成单元格内容"""
+
+    headers = []
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return None
+
+    def set_rows(self, rows):
+        """替换全部记录"""
+        self.beginResetModel()
+        self._rows = list(rows)
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        """在末尾追加记录"""
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def prepend_rows(self, rows):
+        """在开头插入记录"""
+        if not rows:
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+        self._rows[:0] = rows
+        self.endInsertRows()
+
+    def record(self, row):
+        """获取指定行的原始记录"""
+        return self._rows[row]
+
+
+class HistoryTableModel(RecordTableModel):
+    """IP查询历史表格模型"""
+
+    headers = ["时间", "IP地址", "类型", "国家", "省份", "城市", "运营商", "操作"]
+    # 各显示列对应的数据库字段
+    fields = ("time", "ip", "type", "country", "province", "city", "isp")
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        column = index.column()
+        if column >= 7:
+            return None
+        value = self._rows[index.row()][self.fields[column]]
+        # 地理信息缺失时显示"未知"
+        if column >= 3 and not value:
+            return "未知"
+        return value
+
+    def details(self, row):
+        """生成指定行的详情文本"""
+        time_str, ip, ip_type, country, province, city, isp = (
+            self.data(self.index(row, column)) for column in range(7)
+        )
+        return "\n".join([
+            f"查询时间: {time_str}",
+            f"IP地址: {ip}",
+            f"IP类型: {ip_type}",
+            f"地理位置: {country} - {province} - {city}",
+            f"网络运营商: {isp}",
+            "",
+        ])
+
+
+class ClipboardTableModel(RecordTableModel):
+    """剪贴板历史表格模型"""
+
+    headers = ["时间", "剪贴板内容", "包含IP", "操作"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._previews = []
+
+    @staticmethod
+    def _make_previews(rows):
+        """批量生成截断后的内容预览"""
+        return [c if len(c) <= 100 else c[:100] + "..." for c in (r["content"] for r in rows)]
+
+    def set_rows(self, rows):
+        rows = list(rows)
+        self._previews = self._make_previews(rows)
+        super().set_rows(rows)
+
+    def append_rows(self, rows):
+        self._previews.extend(self._make_previews(rows))
+        super().append_rows(rows)
+
+    def prepend_rows(self, rows):
+        self._previews[:0] = self._make_previews(rows)
+        super().prepend_rows(rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return record["time"]
+            if column == 1:
+                return self._previews[index.row()]
+            if column == 2:
+                return "是" if record["contains_ip"] else "否"
+        elif role == Qt.ItemDataRole.ToolTipRole and column == 1:
+            return record["content"]  # 鼠标悬停显示完整内容
+        return None
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    """在单元格中绘制操作按钮，点击时发出 (行号, 按钮序号)"""
+    clicked = pyqtSignal(int, int)
+
+    def __init__(self, labels, parent=None):
+        super().__init__(parent)
+        self.labels = labels
+
+    def _button_rects(self, rect):
+        width = rect.width() // len(self.labels)
+        return [QRect(rect.x() + i * width + 2, rect.y() + 2, width - 4, rect.height() - 4)
+                for i in range(len(self.labels))]
+
+    def paint(self, painter, option, index):
+        # 先绘制背景（含选中状态），再绘制按钮
+        super().paint(painter, option, index)
+        style = QApplication.style()
+        for label, rect in zip(self.labels, self._button_rects(option.rect)):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.text = label
+            button.state = QStyle.StateFlag.State_Enabled
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter)
+
+    def sizeHint(self, option, index):
+        return QSize(50 * len(self.labels), 26)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            pos = event.position().toPoint()
+            for i, rect in enumerate(self._button_rects(option.rect)):
+                if rect.contains(pos):
+                    self.clicked.emit(index.row(), i)
+                    return True
+        return False
+
 
 class HistoryWindow(QDialog):
     """历史记录窗口"""
 
+    # 每页加载的记录数
+    PAGE_SIZE = 200
+
     def __init__(self, db_manager, parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
+        self._cursor_id = None
+        self._has_more = True
+        self._seen_max_id = 0  # 已加载的最大记录id，用于增量刷新
         self.setup_ui()
         self.load_history()
 
@@ -119,11 +652,11 @@ class HistoryWindow(QDialog):
         control_layout = QHBoxLayout()
 
         self.refresh_btn = QPushButton("刷新")
-        self.refresh_btn.clicked.connect(self.load_history)
+        self.refresh_btn.clicked.connect(self.refresh_history)
 
         self.clear_btn = QPushButton("清空记录")
         self.clear_btn.clicked.connect(self.clear_history)
-        self.clear_btn.setStyleSheet("background-color: #ff4444; color: white;")
+        self.clear_btn.setObjectName("dangerBtn")
 
         self.export_btn = QPushButton("导出记录")
         self.export_btn.clicked.connect(self.export_history)
@@ -136,15 +669,21 @@ class HistoryWindow(QDialog):
         layout.addLayout(control_layout)
 
         # 历史记录表格
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels([
-            "时间", "IP地址", "类型", "国家", "省份", "城市", "运营商", "操作"
-        ])
-
-        # 设置表格属性
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table = QTableView()
+        self.model = HistoryTableModel(self)
+        self.table.setModel(self.model)
+
+        # 操作列由委托绘制按钮
+        self.button_delegate = ButtonDelegate(["查看", "复制"], self.table)
+        self.button_delegate.clicked.connect(self.on_button_clicked)
+        self.table.setItemDelegateForColumn(7, self.button_delegate)
+
+        # 设置表格属性（固定初始列宽，避免每次加载都按内容重新测量）
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        for column, width in enumerate((150, 180, 50, 70, 70, 70, 100)):
+            header.resizeSection(column, width)
+        header.setStretchLastSection(True)
         self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
 
@@ -155,58 +694,53 @@ class HistoryWindow(QDialog):
         # 连接双击事件
         self.table.doubleClicked.connect(self.on_table_double_click)
 
+        # 滚动到底部附近时加载下一页
+        self.table.verticalScrollBar().valueChanged.connect(self.on_scroll)
+
         layout.addWidget(self.table)
 
     def load_history(self):
         """加载历史记录"""
-        history = self.db_manager.get_history()
-        self.table.setRowCount(len(history))
-
-        for row, record in enumerate(history):
-            # 时间
-            time_item = QTableWidgetItem(record[1])
-            self.table.setItem(row, 0, time_item)
-
-            # IP地址
-            ip_item = QTableWidgetItem(record[2])
-            self.table.setItem(row, 1, ip_item)
-
-            # IP类型
-            type_item = QTableWidgetItem(record[3])
-            self.table.setItem(row, 2, type_item)
-
-            # 国家
-            country_item = QTableWidgetItem(record[4] if record[4] else "未知")
-            self.table.setItem(row, 3, country_item)
+        self._cursor_id = None
+        self._has_more = True
+        self._seen_max_id = 0
+        self.model.set_rows([])
+        self.fetch_next_page()
 
-            # 省份
-            province_item = QTableWidgetItem(record[5] if record[5] else "未知")
-            self.table.setItem(row, 4, province_item)
-
-            # 城市
-            city_item = QTableWidgetItem(record[6] if record[6] else "未知")
-            self.table.setItem(row, 5, city_item)
-
-            # 运营商
-            isp_item = QTableWidgetItem(record[7] if record[7] else "未知")
-            self.table.setItem(row, 6, isp_item)
-
-            # 操作按钮
-            btn_widget = QWidget()
-            btn_layout = QHBoxLayout(btn_widget)
-            btn_layout.setContentsMargins(0, 0, 0, 0)
-
-            view_btn = QPushButton("查看")
-            view_btn.clicked.connect(lambda checked, ip=record[2]: self.view_ip_details(ip))
-            view_btn.setStyleSheet("padding: 2px 5px; font-size: 12px;")
-
-            copy_btn = QPushButton("复制")
-            copy_btn.clicked.connect(lambda checked, ip=record[2]: self.copy_ip(ip))
-            copy_btn.setStyleSheet("padding: 2px 5px; font-size: 12px;")
-
-            btn_layout.addWidget(view_btn)
-            btn_layout.addWidget(copy_btn)
-            self.table.setCellWidget(row, 7, btn_widget)
+    def refresh_history(self):
+        """刷新历史记录，只加载上次之后新增的记录"""
+        if self._seen_max_id == 0:
+            self.load_history()
+            return
+        rows = self.db_manager.get_history_since(self._seen_max_id)
+        if rows:
+            self._seen_max_id = rows[0]["id"]
+            self.model.prepend_rows(rows)
+
+    def fetch_next_page(self):
+        """加载下一页历史记录"""
+        if not self._has_more:
+            return
+        rows = self.db_manager.get_history_page(self._cursor_id, self.PAGE_SIZE)
+        self._has_more = len(rows) == self.PAGE_SIZE
+        if rows:
+            if self._cursor_id is None:
+                self._seen_max_id = rows[0]["id"]
+            self._cursor_id = rows[-1]["id"]
+            self.model.append_rows(rows)
+
+    def on_scroll(self, value):
+        """表格滚动事件"""
+        if self.table.verticalScrollBar().maximum() - value <= 20:
+            self.fetch_next_page()
+
+    def on_button_clicked(self, row, button):
+        """操作列按钮点击"""
+        ip = self.model.record(row)["ip"]
+        if button == 0:
+            self.view_ip_details(ip)
+        else:
+            self.copy_ip(ip)
 
     def show_context_menu(self, position):
         """显示右键菜单"""
@@ -215,7 +749,7 @@ class HistoryWindow(QDialog):
             menu = QMenu()
 
             # 获取选中行的IP地址
-            ip = self.table.item(row, 1).text()
+            ip = self.model.record(row)["ip"]
 
             # 添加菜单项
             copy_action = QAction("复制IP地址", self)
@@ -236,31 +770,15 @@ class HistoryWindow(QDialog):
     def on_table_double_click(self, index):
         """表格双击事件"""
         row = index.row()
-        if row >= 0:
-            # 获取该行所有数据
-            time_str = self.table.item(row, 0).text()
-            ip = self.table.item(row, 1).text()
-            ip_type = self.table.item(row, 2).text()
-            country = self.table.item(row, 3).text()
-            province = self.table.item(row, 4).text()
-            city = self.table.item(row, 5).text()
-            isp = self.table.item(row, 6).text()
-
-            # 构建详细内容
-            details = f"查询时间: {time_str}\n"
-            details += f"IP地址: {ip}\n"
-            details += f"IP类型: {ip_type}\n"
-            details += f"地理位置: {country} - {province} - {city}\n"
-            details += f"网络运营商: {isp}\n"
-
-            # 显示对话框
-            dialog = DetailDialog(f"IP详情 - {ip}", details, self)
-            dialog.exec()
+        if row >= 0 and index.column() != 7:
+            ip = self.model.record(row)["ip"]
+            show_detail_dialog(self, f"IP详情 - {ip}", self.model.details(row))
 
     def delete_record(self, row):
         """删除单条记录"""
-        ip = self.table.item(row, 1).text()
-        time_str = self.table.item(row, 0).text()
+        record = self.model.record(row)
+        ip = record["ip"]
+        time_str = record["time"]
 
         reply = QMessageBox.question(
             self, "确认删除",
@@ -283,7 +801,7 @@ class HistoryWindow(QDialog):
 
     def copy_ip(self, ip):
         """复制IP地址"""
-        pyperclip.copy(ip)
+        QApplication.clipboard().setText(ip)
         QMessageBox.information(self, "成功", f"已复制IP地址: {ip}")
 
     def clear_history(self):
@@ -313,41 +831,40 @@ class HistoryWindow(QDialog):
                 self,
                 "导出历史记录",
                 default_filename,
-                "JSON文件 (*.json);;所有文件 (*.*)"
+                "JSON文件 (*.json);;CSV文件 (*.csv);;所有文件 (*.*)"
             )
 
             if not file_path:
                 return  # 用户取消
 
-            history = self.db_manager.get_history(limit=1000)  # 导出所有记录
-            export_data = []
-
-            for record in history:
-                export_data.append({
-                    "time": record[1],
-                    "ip": record[2],
-                    "type": record[3],
-                    "country": record[4],
-                    "province": record[5],
-                    "city": record[6],
-                    "isp": record[7],
-                    "query_time": record[8]
-                })
-
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
-
-            QMessageBox.information(self, "导出成功", f"历史记录已导出到:\n{file_path}")
+            # 在后台线程中逐条读取并写入，内存占用与记录总数无关
+            self.export_worker = start_export(
+                self, self.export_btn, self.db_manager.iter_history(), file_path,
+                HISTORY_EXPORT_FORMAT, self.on_export_finished
+            )
         except Exception as e:
             QMessageBox.critical(self, "导出失败", f"导出失败: {str(e)}")
 
+    def on_export_finished(self, success, message):
+        """导出完成"""
+        if success:
+            QMessageBox.information(self, "导出成功", f"历史记录已导出到:\n{message}")
+        else:
+            QMessageBox.critical(self, "导出失败", f"导出失败: {message}")
+
 
 class ClipboardHistoryWindow(QDialog):
     """剪贴板历史记录窗口"""
 
+    # 每页加载的记录数
+    PAGE_SIZE = 200
+
     def __init__(self, db_manager, parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
+        self._cursor_id = None
+        self._has_more = True
+        self._seen_max_id = 0  # 已加载的最大记录id，用于增量刷新
         self.setup_ui()
         self.load_clipboard_history()
 
@@ -361,11 +878,11 @@ class ClipboardHistoryWindow(QDialog):
         control_layout = QHBoxLayout()
 
         self.refresh_btn = QPushButton("刷新")
-        self.refresh_btn.clicked.connect(self.load_clipboard_history)
+        self.refresh_btn.clicked.connect(self.refresh_clipboard_history)
 
         self.clear_btn = QPushButton("清空记录")
         self.clear_btn.clicked.connect(self.clear_clipboard_history)
-        self.clear_btn.setStyleSheet("background-color: #ff4444; color: white;")
+        self.clear_btn.setObjectName("dangerBtn")
 
         self.export_btn = QPushButton("导出记录")
         self.export_btn.clicked.connect(self.export_clipboard_history)
@@ -378,15 +895,21 @@ class ClipboardHistoryWindow(QDialog):
         layout.addLayout(control_layout)
 
         # 历史记录表格
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels([
-            "时间", "剪贴板内容", "包含IP", "操作"
-        ])
-
-        # 设置表格属性
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table = QTableView()
+        self.model = ClipboardTableModel(self)
+        self.table.setModel(self.model)
+
+        # 操作列由委托绘制按钮
+        self.button_delegate = ButtonDelegate(["查看", "复制"], self.table)
+        self.button_delegate.clicked.connect(self.on_button_clicked)
+        self.table.setItemDelegateForColumn(3, self.button_delegate)
+
+        # 设置表格属性（固定初始列宽，避免每次加载都按内容重新测量）
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        for column, width in enumerate((150, 500, 60)):
+            header.resizeSection(column, width)
+        header.setStretchLastSection(True)
         self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
 
@@ -397,50 +920,53 @@ class ClipboardHistoryWindow(QDialog):
         # 连接双击事件
         self.table.doubleClicked.connect(self.on_table_double_click)
 
+        # 滚动到底部附近时加载下一页
+        self.table.verticalScrollBar().valueChanged.connect(self.on_scroll)
+
         layout.addWidget(self.table)
 
     def load_clipboard_history(self):
         """加载剪贴板历史记录"""
-        history = self.db_manager.get_clipboard_history()
-        self.table.setRowCount(len(history))
-
-        for row, record in enumerate(history):
-            # 时间
-            time_item = QTableWidgetItem(record[1])
-            self.table.setItem(row, 0, time_item)
-
-            # 剪贴板内容
-            content = record[2]
-            # 截断长内容
-            if len(content) > 100:
-                display_content = content[:100] + "..."
-            else:
-                display_content = content
-            content_item = QTableWidgetItem(display_content)
-            content_item.setToolTip(content)  # 鼠标悬停显示完整内容
-            self.table.setItem(row, 1, content_item)
-
-            # 包含IP
-            contains_ip = record[3]
-            ip_item = QTableWidgetItem("是" if contains_ip else "否")
-            self.table.setItem(row, 2, ip_item)
-
-            # 操作按钮
-            btn_widget = QWidget()
-            btn_layout = QHBoxLayout(btn_widget)
-            btn_layout.setContentsMargins(0, 0, 0, 0)
+        self._cursor_id = None
+        self._has_more = True
+        self._seen_max_id = 0
+        self.model.set_rows([])
+        self.fetch_next_page()
 
-            copy_btn = QPushButton("复制")
-            copy_btn.clicked.connect(lambda checked, content=content: self.copy_content(content))
-            copy_btn.setStyleSheet("padding: 2px 5px; font-size: 12px;")
-
-            view_btn = QPushButton("查看")
-            view_btn.clicked.connect(lambda checked, content=content: self.view_content(content))
-            view_btn.setStyleSheet("padding: 2px 5px; font-size: 12px;")
-
-            btn_layout.addWidget(view_btn)
-            btn_layout.addWidget(copy_btn)
-            self.table.setCellWidget(row, 3, btn_widget)
+    def refresh_clipboard_history(self):
+        """刷新剪贴板历史记录，只加载上次之后新增的记录"""
+        if self._seen_max_id == 0:
+            self.load_clipboard_history()
+            return
+        rows = self.db_manager.get_clipboard_history_since(self._seen_max_id)
+        if rows:
+            self._seen_max_id = rows[0]["id"]
+            self.model.prepend_rows(rows)
+
+    def fetch_next_page(self):
+        """加载下一页剪贴板历史记录"""
+        if not self._has_more:
+            return
+        rows = self.db_manager.get_clipboard_history_page(self._cursor_id, self.PAGE_SIZE)
+        self._has_more = len(rows) == self.PAGE_SIZE
+        if rows:
+            if self._cursor_id is None:
+                self._seen_max_id = rows[0]["id"]
+            self._cursor_id = rows[-1]["id"]
+            self.model.append_rows(rows)
+
+    def on_scroll(self, value):
+        """表格滚动事件"""
+        if self.table.verticalScrollBar().maximum() - value <= 20:
+            self.fetch_next_page()
+
+    def on_button_clicked(self, row, button):
+        """操作列按钮点击"""
+        content = self.model.record(row)["content"]
+        if button == 0:
+            self.view_content(content)
+        else:
+            self.copy_content(content)
 
     def show_context_menu(self, position):
         """显示右键菜单"""
@@ -449,7 +975,7 @@ class ClipboardHistoryWindow(QDialog):
             menu = QMenu()
 
             # 获取选中行的数据
-            content = self.table.item(row, 1).toolTip() or self.table.item(row, 1).text()
+            content = self.model.record(row)["content"]
 
             # 添加菜单项
             copy_action = QAction("复制内容", self)
@@ -470,26 +996,26 @@ class ClipboardHistoryWindow(QDialog):
     def on_table_double_click(self, index):
         """表格双击事件"""
         row = index.row()
-        if row >= 0:
+        if row >= 0 and index.column() != 3:
             # 获取该行所有数据
-            time_str = self.table.item(row, 0).text()
-            content = self.table.item(row, 1).toolTip() or self.table.item(row, 1).text()
-            contains_ip = self.table.item(row, 2).text()
+            record = self.model.record(row)
+            time_str = record["time"]
+            content = record["content"]
+            contains_ip = "是" if record["contains_ip"] else "否"
 
             # 构建详细内容
             details = f"记录时间: {time_str}\n"
             details += f"包含IP: {contains_ip}\n"
             details += f"内容长度: {len(content)} 字符\n"
-            details += f"\n完整内容:\n{'-' * 40}\n{content}\n{'-' * 40}"
+            details += f"\n完整内容:\n{'-' * 40}\n{truncate_for_display(content)}\n{'-' * 40}"
 
             # 显示对话框
-            dialog = DetailDialog("剪贴板内容详情", details, self)
-            dialog.exec()
+            show_detail_dialog(self, "剪贴板内容详情", details)
 
     def delete_record(self, row):
         """删除单条记录"""
-        time_str = self.table.item(row, 0).text()
-        content_preview = self.table.item(row, 1).text()
+        time_str = self.model.record(row)["time"]
+        content_preview = self.model.index(row, 1).data()
 
         reply = QMessageBox.question(
             self, "确认删除",
@@ -508,13 +1034,12 @@ class ClipboardHistoryWindow(QDialog):
 
     def copy_content(self, content):
         """复制内容"""
-        pyperclip.copy(content)
+        QApplication.clipboard().setText(content)
         QMessageBox.information(self, "成功", "已复制内容到剪贴板")
 
     def view_content(self, content):
         """查看内容详情"""
-        dialog = DetailDialog("剪贴板内容详情", content, self)
-        dialog.exec()
+        show_detail_dialog(self, "剪贴板内容详情", truncate_for_display(content))
 
     def clear_clipboard_history(self):
         """清空剪贴板历史记录"""
@@ -543,71 +1068,26 @@ class ClipboardHistoryWindow(QDialog):
                 self,
                 "导出剪贴板历史记录",
                 default_filename,
-                "JSON文件 (*.json);;所有文件 (*.*)"
+                "JSON文件 (*.json);;CSV文件 (*.csv);;所有文件 (*.*)"
             )
 
             if not file_path:
                 return  # 用户取消
 
-            history = self.db_manager.get_clipboard_history(limit=1000)
-            export_data = []
-
-            for record in history:
-                export_data.append({
-                    "time": record[1],
-                    "content": record[2],
-                    "contains_ip": bool(record[3])
-                })
-
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
-
-            QMessageBox.information(self, "导出成功", f"剪贴板历史记录已导出到:\n{file_path}")
+            # 在后台线程中逐条读取并写入，内存占用与记录总数无关
+            self.export_worker = start_export(
+                self, self.export_btn, self.db_manager.iter_clipboard_history(), file_path,
+                CLIPBOARD_EXPORT_FORMAT, self.on_export_finished
+            )
         except Exception as e:
             QMessageBox.critical(self, "导出失败", f"导出失败: {str(e)}")
 
-
-class UpdateChecker(QThread):
-    """更新检查线程"""
-    update_available = pyqtSignal(dict)  # 传递更新信息
-    check_completed = pyqtSignal(bool, str)  # (是否有更新, 消息)
-
-    def __init__(self, config):
-        super().__init__()
-        self.config = config
-
-    def run(self):
-        try:
-            # 检查更新
-            print("正在检查更新...")
-            remote_info = self.config.check_for_updates()
-            print(f"获取到的更新信息: {remote_info}")
-
-            if remote_info and remote_info.get('success'):
-                data = remote_info.get('data', {})
-                remote_version = data.get('version')
-
-                if remote_version:
-                    print(f"远程版本: {remote_version}, 本地版本: {self.config.app_version}")
-
-                    if self.config.is_new_version_available(remote_version):
-                        print(f"发现新版本: {remote_version}")
-                        # 确保在主线程中发射信号
-                        self.update_available.emit(data)  # 传递data而不是remote_info
-                        self.check_completed.emit(True, f"发现新版本 {remote_version}")
-                    else:
-                        print("当前已是最新版本")
-                        self.check_completed.emit(False, "当前已是最新版本")
-                else:
-                    print("更新信息中缺少版本号")
-                    self.check_completed.emit(False, "检查更新失败：版本信息不完整")
-            else:
-                print("检查更新失败或无更新信息")
-                self.check_completed.emit(False, "检查更新失败或网络错误")
-
-        except Exception as e:
-            print(f"检查更新异常: {e}")
-            self.check_completed.emit(False, f"检查更新失败: {str(e)}")
+    def on_export_finished(self, success, message):
+        """导出完成"""
+        if success:
+            QMessageBox.information(self, "导出成功", f"剪贴板历史记录已导出到:\n{message}")
+        else:
+            QMessageBox.critical(self, "导出失败", f"导出失败: {message}")
 
 
 class SettingsWindow(QDialog):
@@ -639,25 +1119,9 @@ class SettingsWindow(QDialog):
         # 分隔线
         line1 = QWidget()
         line1.setFixedHeight(1)
-        line1.setStyleSheet("background-color: #ddd;")
+        line1.setObjectName("separator")
         layout.addWidget(line1)
 
-        # 剪贴板检查间隔
-        interval_widget = QWidget()
-        interval_layout = QHBoxLayout(interval_widget)
-        interval_layout.setContentsMargins(0, 0, 0, 0)
-
-        interval_label = QLabel("检查间隔:")
-        self.interval_spin = QDoubleSpinBox()
-        self.interval_spin.setRange(0.5, 10.0)
-        self.interval_spin.setSingleStep(0.5)
-        self.interval_spin.setSuffix(" 秒")
-
-        interval_layout.addWidget(interval_label)
-        interval_layout.addStretch()
-        interval_layout.addWidget(self.interval_spin)
-        layout.addWidget(interval_widget)
-
         # 通知设置
         self.notify_cb = QCheckBox("显示桌面通知")
         layout.addWidget(self.notify_cb)
@@ -696,7 +1160,7 @@ class SettingsWindow(QDialog):
         # 分隔线
         line2 = QWidget()
         line2.setFixedHeight(1)
-        line2.setStyleSheet("background-color: #ddd;")
+        line2.setObjectName("separator")
         layout.addWidget(line2)
 
         # 更新设置
@@ -706,7 +1170,7 @@ class SettingsWindow(QDialog):
         # 检查更新按钮
         self.check_update_btn = QPushButton("立即检查更新")
         self.check_update_btn.clicked.connect(self.check_update)
-        self.check_update_btn.setStyleSheet("background-color: #3498db; color: white; padding: 5px;")
+        self.check_update_btn.setObjectName("checkUpdateBtn")
         layout.addWidget(self.check_update_btn)
 
         # 添加弹性空间
@@ -717,11 +1181,11 @@ class SettingsWindow(QDialog):
 
         self.save_btn = QPushButton("保存设置")
         self.save_btn.clicked.connect(self.save_settings)
-        self.save_btn.setStyleSheet("background-color: #27ae60; color: white; padding: 8px;")
+        self.save_btn.setObjectName("saveBtn")
 
         self.cancel_btn = QPushButton("取消")
         self.cancel_btn.clicked.connect(self.reject)
-        self.cancel_btn.setStyleSheet("padding: 8px;")
+        self.cancel_btn.setObjectName("cancelBtn")
 
         button_layout.addWidget(self.save_btn)
         button_layout.addWidget(self.cancel_btn)
@@ -731,7 +1195,6 @@ class SettingsWindow(QDialog):
     def load_settings(self):
         """加载设置"""
         self.auto_start_cb.setChecked(self.config.auto_start)
-        self.interval_spin.setValue(self.config.check_interval)
         self.notify_cb.setChecked(self.config.notifications)
         self.ipv4_cb.setChecked(getattr(self.config, 'enable_ipv4', True))
         self.ipv6_cb.setChecked(getattr(self.config, 'enable_ipv6', True))
@@ -775,16 +1238,14 @@ class SettingsWindow(QDialog):
         new_auto_start = self.auto_start_cb.isChecked()
 
         # 更新配置
-        self.config.auto_start = new_auto_start
-        self.config.check_interval = self.interval_spin.value()
-        self.config.notifications = self.notify_cb.isChecked()
-        self.config.enable_ipv4 = self.ipv4_cb.isChecked()
-        self.config.enable_ipv6 = self.ipv6_cb.isChecked()
-        self.config.notification_timeout = self.timeout_spin.value()
-        self.config.auto_check_update = self.auto_update_cb.isChecked()
-
-        # 保存配置
-        self.config.save_config()
+        self.config.update_config(
+            auto_start=new_auto_start,
+            notifications=self.notify_cb.isChecked(),
+            enable_ipv4=self.ipv4_cb.isChecked(),
+            enable_ipv6=self.ipv6_cb.isChecked(),
+            notification_timeout=self.timeout_spin.value(),
+            auto_check_update=self.auto_update_cb.isChecked()
+        )
 
         # 如果自启动设置发生变化，更新注册表
         if old_auto_start != new_auto_start:
@@ -800,83 +1261,147 @@ class SettingsWindow(QDialog):
         self.accept()
 
 
+class NotificationSignals(QObject):
+    """NotificationManager 的信号（通知线程中发出，在界面线程处理）"""
+    log = pyqtSignal(str, str)  # (消息, 日志类型)
+
+
 class NotificationManager:
     """增强的通知管理器"""
 
+    # 相同标题和IP的通知在该时间（秒）内只发送一次
+    DEDUP_WINDOW = 5.0
+    DEDUP_MAX_ENTRIES = 64
+    # 通知方式连续失败超过该次数后，暂停使用一段时间（秒）
+    MAX_METHOD_FAILURES = 3
+    METHOD_RETRY_DELAY = 60
+
     def __init__(self, app_name="IP Analyzer", parent=None):
         self.app_name = app_name
         self.parent = parent
         self.last_ip = None
         self.last_ip_url = None
         self.notification_methods = []
+        self._recent = OrderedDict()  # (title, ip) -> 最近发送时间，只在通知线程中访问
+        self.signals = NotificationSignals()
 
-        # 初始化所有可用的通知方法
+        # 初始化所有可用的通知方法，启动时确定一次是否有系统级通知方式（自定义通知除外）
         self.init_notification_methods()
+        self._system_available = any(method[0] != "custom" for method in self.notification_methods)
+
+        # 通知由后台线程依次发送，调用方不必等待各通知方式执行
+        self._queue = queue.Queue()
+        threading.Thread(target=self._notification_loop, daemon=True).start()
 
     def init_notification_methods(self):
-        """初始化通知方法"""
+        """初始化通知方法，每项为 [名称, 函数, 连续失败次数, 暂停至(monotonic)]"""
         self.notification_methods = []
 
-        # 方法1: 使用plyer (基础)
-        try:
-            self.notification_methods.append(("plyer", self.show_plyer_notification))
-            print("✓ Plyer通知可用")
-        except:
-            print("✗ Plyer通知不可用")
-
-        # 方法2: 使用win10toast (Windows 10+)
-        if WIN10TOAST_AVAILABLE:
-            try:
-                self.toaster = win10toast.ToastNotifier()
-                self.notification_methods.append(("win10toast", self.show_win10toast_notification))
-                print("✓ Win10Toast通知可用")
-            except Exception as e:
-                print(f"✗ Win10Toast通知不可用: {e}")
-                self.toaster = None
+        # 方法1: 使用plyer (基础)，只检查是否已安装，发送时才导入
+        if importlib.util.find_spec("plyer") is not None:
+            self.notification_methods.append(["plyer", self.show_plyer_notification, 0, 0.0])
+            logger.debug("✓ Plyer通知可用")
         else:
-            print("✗ Win10Toast不可用（未安装）")
+            logger.warning("✗ Plyer不可用（未安装）")
+
+        # 方法2: 使用win10toast (Windows 10+)，用到时才导入
+        try:
+            import win10toast
+
+            self.toaster = win10toast.ToastNotifier()
+            self.notification_methods.append(["win10toast", self.show_win10toast_notification, 0, 0.0])
+            logger.debug("✓ Win10Toast通知可用")
+        except ImportError:
+            logger.warning("✗ Win10Toast不可用（未安装）")
+            self.toaster = None
+        except Exception as e:
+            logger.warning("✗ Win10Toast通知不可用: %s", e)
+            self.toaster = None
 
         # 方法3: 使用系统托盘消息
         try:
             if self.parent and hasattr(self.parent, 'tray_icon'):
-                self.notification_methods.append(("tray", self.show_tray_notification))
-                print("系统托盘通知可用")
+                self.notification_methods.append(["tray", self.show_tray_notification, 0, 0.0])
+                logger.debug("系统托盘通知可用")
         except:
-            print("系统托盘通知不可用")
+            logger.warning("系统托盘通知不可用")
 
         # 方法4: 使用自定义窗口
         try:
-            self.notification_methods.append(("custom", self.show_custom_notification))
-            print("自定义通知可用")
+            self.notification_methods.append(["custom", self.show_custom_notification, 0, 0.0])
+            logger.debug("自定义通知可用")
         except:
-            print("自定义通知不可用")
+            logger.warning("自定义通知不可用")
 
     def show_notification(self, title, message, ip=None, duration=10):
-        """显示通知"""
+        """显示通知（加入发送队列后立即返回）"""
+        if not self._system_available:
+            # 没有系统级通知方式，不经过队列和各通知方式，直接写入活动日志
+            self.show_custom_notification(title, message, duration)
+            return False
+
+        self._queue.put((title, message, ip, duration, time.monotonic()))
+        return True
+
+    def _notification_loop(self):
+        """通知发送线程，去重和发送都在此线程中依次进行"""
+        while True:
+            title, message, ip, duration, queued_at = self._queue.get()
+            if self._is_duplicate(title, ip, queued_at):
+                logger.debug("忽略重复通知: %s", title)
+                continue
+            self._dispatch_notification(title, message, ip, duration)
+
+    def _is_duplicate(self, title, ip, now):
+        """相同标题和IP的通知在 DEDUP_WINDOW 内是否已发送过（并记录本次）"""
+        key = (title, ip)
+        last = self._recent.get(key)
+        if last is not None and now - last < self.DEDUP_WINDOW:
+            return True
+        self._recent[key] = now
+        self._recent.move_to_end(key)
+        if len(self._recent) > self.DEDUP_MAX_ENTRIES:
+            self._recent.popitem(last=False)
+        return False
+
+    def _dispatch_notification(self, title, message, ip, duration):
+        """依次尝试各通知方式，直到有一个成功"""
         self.last_ip = ip
         if ip:
             self.last_ip_url = f"https://ipv4.ink/{ip}"
 
-        if not self.notification_methods:
-            print("没有可用的通知方法")
-            return False
-
-        # 尝试所有可用的通知方法
-        for method_name, method_func in self.notification_methods:
+        # 尝试所有可用的通知方法，上次成功的排在最前，跳过暂停中的方法
+        now = time.monotonic()
+        for method in list(self.notification_methods):
+            method_name, method_func, failures, paused_until = method
+            if now < paused_until:
+                continue
             try:
-                print(f"尝试使用 {method_name} 显示通知")
-                if method_func(title, message, duration):
-                    return True
+                logger.debug("尝试使用 %s 显示通知", method_name)
+                success = method_func(title, message, duration)
             except Exception as e:
-                print(f"{method_name} 通知失败: {str(e)}")
-                continue
+                logger.warning("%s 通知失败: %s", method_name, e)
+                success = False
+
+            if success:
+                method[2] = 0
+                self.notification_methods.remove(method)
+                self.notification_methods.insert(0, method)
+                return True
+
+            method[2] = failures + 1
+            if method[2] > self.MAX_METHOD_FAILURES:
+                method[3] = now + self.METHOD_RETRY_DELAY
+                logger.warning("%s 连续失败，暂停使用 %s 秒", method_name, self.METHOD_RETRY_DELAY)
 
-        print("所有通知方法都失败了")
+        logger.warning("所有通知方法都失败了")
         return False
 
     def show_plyer_notification(self, title, message, duration):
         """使用plyer显示通知"""
         try:
+            from plyer import notification
+
             notification.notify(
                 title=title,
                 message=message,
@@ -885,16 +1410,18 @@ class NotificationManager:
                 app_icon=None,
                 toast=False
             )
-            print("✓ Plyer通知发送成功")
+            logger.debug("✓ Plyer通知发送成功")
             return True
         except Exception as e:
-            print(f"Plyer通知失败: {e}")
+            logger.warning("Plyer通知失败: %s", e)
             return False
 
     def show_win10toast_notification(self, title, message, duration):
         """使用win10toast显示通知"""
         try:
-            self.toaster.show_toast(
+            # threaded=False 会阻塞通知线程直到提示消失（duration 秒），后续通知都要排队等待；
+            # 由 win10toast 自己的线程显示，上一条提示仍在显示时返回 False，改用其他通知方式
+            shown = self.toaster.show_toast(
                 title=title,
                 msg=message,
                 duration=duration,
@@ -902,10 +1429,13 @@ class NotificationManager:
                 threaded=True,
                 callback_on_click=self.on_notification_click
             )
-            print("✓ Win10Toast通知发送成功")
+            if not shown:
+                logger.debug("Win10Toast 上一条通知仍在显示")
+                return False
+            logger.debug("✓ Win10Toast通知发送成功")
             return True
         except Exception as e:
-            print(f"Win10Toast通知失败: {e}")
+            logger.warning("Win10Toast通知失败: %s", e)
             return False
 
     def show_tray_notification(self, title, message, duration):
@@ -918,111 +1448,160 @@ class NotificationManager:
                     QSystemTrayIcon.MessageIcon.Information,
                     duration * 1000  # 转换为毫秒
                 )
-                print("系统托盘通知发送成功")
+                logger.debug("系统托盘通知发送成功")
                 return True
         except Exception as e:
-            print(f"系统托盘通知失败: {e}")
+            logger.warning("系统托盘通知失败: %s", e)
         return False
 
     def show_custom_notification(self, title, message, duration):
-        """显示自定义通知窗口（备选方案）"""
+        """显示自定义通知（备选方案，写入主窗口的活动日志）"""
         try:
-            # 在单独的线程中显示，避免阻塞主线程
-            thread = threading.Thread(
-                target=self._show_custom_notification_thread,
-                args=(title, message, duration),
-                daemon=True
-            )
-            thread.start()
+            logger.info("通知: %s\n内容: %s", title, message)
+            # 在通知线程中发出，由界面线程写入日志
+            self.signals.log.emit(f"通知: {title}\n{message}", "info")
             return True
         except Exception as e:
-            print(f"自定义通知失败: {e}")
+            logger.warning("自定义通知失败: %s", e)
             return False
 
-    def _show_custom_notification_thread(self, title, message, duration):
-        """自定义通知线程"""
-        try:
-            # 创建一个简单的提示
-            print(f"\n{'=' * 50}")
-            print(f"通知: {title}")
-            print(f"内容: {message}")
-            print(f"{'=' * 50}\n")
-
-            # 模拟通知显示时间
-            time.sleep(min(duration, 5))
-        except:
-            pass
-
     def on_notification_click(self):
         """通知点击回调"""
         if self.last_ip_url:
-            print(f"通知被点击，打开: {self.last_ip_url}")
+            logger.debug("通知被点击，打开: %s", self.last_ip_url)
             webbrowser.open(self.last_ip_url)
 
 
+class AutostartSignals(QObject):
+    """AutostartWorker 的信号（QRunnable 本身不能定义信号）"""
+    log = pyqtSignal(str, str)  # (消息, 日志类型)
+
+
+class AutostartWorker(QRunnable):
+    """在线程池中按配置设置开机自启动，避免注册表读写阻塞界面线程"""
+
+    def __init__(self, window):
+        super().__init__()
+        self.window = window
+        self.signals = AutostartSignals()
+        self.signals.log.connect(window.add_log)
+
+    def run(self):
+        self.window.setup_autostart(self.signals.log.emit)
+
+
 class IPAnalyzer(QMainWindow):
+    # 界面字体只创建一次，各控件共用
+    _TITLE_FONT = QFont("Microsoft YaHei", 18, QFont.Weight.Bold)
+    _INDICATOR_FONT = QFont("Arial", 14, QFont.Weight.Bold)
+    _LABEL_FONT = QFont("Microsoft YaHei", 10)
+    _BOLD_LABEL_FONT = QFont("Microsoft YaHei", 10, QFont.Weight.Bold)
+    _DETAIL_FONT = QFont("Microsoft YaHei", 9)
+    _MONO_FONT = QFont("Consolas", 10, QFont.Weight.Bold)
+    _LOG_FONT = QFont("Consolas", 9)
+    # 应用图标，首次绘制后缓存
+    _APP_ICON = None
+    # 表格刷新合并间隔（毫秒），连续的刷新请求在此间隔内只执行一次
+    REFRESH_DELAY_MS = 50
+    # 日志区域最多保留的行数
+    MAX_LOG_LINES = 1000
+
+    history_saved = pyqtSignal()  # IP查询结果已写入历史记录（在线程池中发出）
+
     def __init__(self):
         super().__init__()
+        QApplication.instance().setStyleSheet(APP_STYLE_SHEET)
+
+        # 短时后台任务（自启动设置、IP查询、连接测试）共用全局线程池
+        QThreadPool.globalInstance().setMaxThreadCount(4)
+
         self.config = Config()
         self.db_manager = DatabaseManager()
         self.notification_manager = NotificationManager(self.config.app_name, self)
+        self.notification_manager.signals.log.connect(self.add_log)
 
         self.current_ip = None
         self.last_clipboard_content = ""
+        self._last_clipboard_raw = ""  # 未 strip 的原始剪贴板文本，未变化时跳过处理
         self.api_connected = False
+        self._last_status = None  # 上次显示的 (状态, 消息)，未变化时跳过界面更新
+        # 历史记录窗口首次打开时创建，之后复用
+        self._history_window = None
+        self._clipboard_history_window = None
+        # 开机自启动状态缓存，只在读取或修改注册表后更新
+        self._autostart_cache = None
+        self._tray_menu = None  # 托盘菜单，首次设置托盘时创建
+        # IP查询/API测试共用的HTTP会话，首次请求时创建
+        self._http_session = None
+        self._http_lock = threading.Lock()
+        self._log_timestamp = (0, "")  # (秒, 格式化后的时间)，add_log 复用
+
+        # 合并短时间内的多次表格刷新
+        self._history_refresh_timer = QTimer(self)
+        self._history_refresh_timer.setSingleShot(True)
+        self._history_refresh_timer.setInterval(self.REFRESH_DELAY_MS)
+        self._history_refresh_timer.timeout.connect(self.refresh_history)
+        self._clipboard_refresh_timer = QTimer(self)
+        self._clipboard_refresh_timer.setSingleShot(True)
+        self._clipboard_refresh_timer.setInterval(self.REFRESH_DELAY_MS)
+        self._clipboard_refresh_timer.timeout.connect(self.refresh_clipboard_history)
+        self.history_saved.connect(self.on_history_saved)
+        # 标签页不可见时只标记数据已变化，切换到该标签页时再刷新
+        self._history_dirty = False
+        self._clipboard_dirty = False
 
         self.setup_ui()
         self.setup_tray()
         self.start_api_checker()
         self.start_clipboard_monitor()
 
-        # 根据配置设置自启动
-        self.setup_autostart()
+        # 根据配置设置自启动（在后台线程中进行）
+        self._autostart_worker = AutostartWorker(self)
+        QThreadPool.globalInstance().start(self._autostart_worker)
 
         # 检查更新（如果启用）
         if self.config.auto_check_update:
             QTimer.singleShot(3000, lambda: self.check_for_updates(silent=True))
 
-    def setup_autostart(self):
-        """根据配置设置开机自启动"""
+    def setup_autostart(self, log=None):
+        """根据配置设置开机自启动，log 为日志函数（默认 add_log）"""
+        log = log or self.add_log
         try:
             if self.config.auto_start:
                 # 只有配置为True时才设置自启动
-                success = self.set_autostart(True)
+                success = self.set_autostart(True, log)
                 if success:
-                    self.add_log("已设置开机自启动", "success")
+                    log("已设置开机自启动", "success")
                 else:
-                    self.add_log("设置开机自启动失败", "warning")
+                    log("设置开机自启动失败", "warning")
             else:
                 # 检查是否已设置，如果已设置则清除
                 current_status = self.check_autostart_status()
                 if current_status:
-                    success = self.set_autostart(False)
+                    success = self.set_autostart(False, log)
                     if success:
-                        self.add_log("已清除开机自启动", "info")
+                        log("已清除开机自启动", "info")
 
         except Exception as e:
-            self.add_log(f"自启动设置错误: {str(e)}", "error")
-
-    def set_autostart(self, enable: bool) -> bool:
+            log(f"自启动设置错误: {str(e)}", "error")
+
+    @staticmethod
+    def autostart_command():
+        """开机自启动注册表项中写入的启动命令"""
+        if getattr(sys, 'frozen', False):
+            # 打包后的exe，路径中有空格时加引号
+            app_path = sys.executable
+            return f'"{app_path}"' if ' ' in app_path else app_path
+        # 开发环境中的python脚本
+        return f'"{sys.executable}" "{os.path.abspath(__file__)}"'
+
+    def set_autostart(self, enable: bool, log=None) -> bool:
         """设置开机自启动"""
+        log = log or self.add_log
         try:
             import winreg
 
-            # 获取程序路径
-            if getattr(sys, 'frozen', False):
-                # 打包后的exe
-                app_path = sys.executable
-            else:
-                # 开发环境中的python脚本
-                app_path = sys.executable
-                script_path = os.path.abspath(__file__)
-                app_path = f'"{app_path}" "{script_path}"'
-
-            # 处理路径中的空格（确保有引号）
-            if ' ' in app_path and not app_path.startswith('"'):
-                app_path = f'"{app_path}"'
-
+            app_path = self.autostart_command()
             app_name = self.config.app_name
 
             key = winreg.HKEY_CURRENT_USER
@@ -1036,37 +1615,40 @@ class IPAnalyzer(QMainWindow):
                 if enable:
                     # 添加开机启动项
                     winreg.SetValueEx(reg_key, app_name, 0, winreg.REG_SZ, app_path)
-                    self.add_log(f"已添加开机自启动: {app_path}", "info")
+                    log(f"已添加开机自启动: {app_path}", "info")
                 else:
                     # 删除开机启动项
                     try:
                         winreg.DeleteValue(reg_key, app_name)
-                        self.add_log(f"已移除开机自启动", "info")
+                        log(f"已移除开机自启动", "info")
                     except FileNotFoundError:
                         # 启动项不存在
                         pass
 
                 winreg.CloseKey(reg_key)
+                self._autostart_cache = enable
 
                 # 更新配置
-                self.config.auto_start = enable
-                self.config.save_config()
+                self.config.update_config(auto_start=enable)
 
                 return True
 
             except PermissionError:
-                self.add_log("权限不足，请以管理员身份运行程序", "error")
+                log("权限不足，请以管理员身份运行程序", "error")
                 return False
             except Exception as e:
-                self.add_log(f"设置自启动失败: {str(e)}", "error")
+                log(f"设置自启动失败: {str(e)}", "error")
                 return False
 
         except Exception as e:
-            self.add_log(f"自启动设置错误: {str(e)}", "error")
+            log(f"自启动设置错误: {str(e)}", "error")
             return False
 
     def check_autostart_status(self) -> bool:
-        """检查当前是否已设置开机自启动"""
+        """检查当前是否已设置开机自启动（结果缓存，直到下次修改）"""
+        if self._autostart_cache is not None:
+            return self._autostart_cache
+
         try:
             import winreg
 
@@ -1077,36 +1659,25 @@ class IPAnalyzer(QMainWindow):
             try:
                 # 打开注册表键
                 reg_key = winreg.OpenKey(key, key_path, 0,
-                                         winreg.KEY_READ | winreg.KEY_WOW64_64KEY)
+                                         winreg.KEY_QUERY_VALUE | winreg.KEY_WOW64_64KEY)
 
                 # 尝试读取值
                 try:
                     value, _ = winreg.QueryValueEx(reg_key, app_name)
-                    winreg.CloseKey(reg_key)
-
-                    if value:
-                        # 验证路径是否有效
-                        current_path = value.strip('"')
-
-                        # 获取当前程序路径
-                        if getattr(sys, 'frozen', False):
-                            expected_path = sys.executable
-                        else:
-                            expected_path = f'{sys.executable} "{os.path.abspath(__file__)}"'
-
-                        expected_path = expected_path.strip('"')
-
-                        # 比较路径（规范化路径进行比较）
-                        if os.path.exists(current_path):
-                            return True
-                        else:
-                            # 路径无效，可能需要更新
-                            return False
-                    return False
-
                 except FileNotFoundError:
+                    value = None
+                finally:
                     winreg.CloseKey(reg_key)
-                    return False
+
+                # 与当前启动命令一致时直接认为有效，否则检查路径是否存在
+                if not value:
+                    self._autostart_cache = False
+                elif os.path.normcase(os.path.normpath(value)) == \
+                        os.path.normcase(os.path.normpath(self.autostart_command())):
+                    self._autostart_cache = True
+                else:
+                    self._autostart_cache = os.path.exists(value.strip('"'))
+                return self._autostart_cache
 
             except Exception as e:
                 print(f"检查自启动状态失败: {str(e)}")
@@ -1131,11 +1702,30 @@ class IPAnalyzer(QMainWindow):
         # 主页标签
         self.setup_main_tab()
 
-        # 历史记录标签
-        self.setup_history_tab()
+        # 历史记录和剪贴板历史记录标签，首次切换到时才创建内容
+        self.history_tab = QWidget()
+        self.history_table = None
+        self.tab_widget.addTab(self.history_tab, "历史记录")
+
+        self.clipboard_tab = QWidget()
+        self.clipboard_table = None
+        self.tab_widget.addTab(self.clipboard_tab, "剪贴板历史")
 
-        # 剪贴板历史记录标签
-        self.setup_clipboard_history_tab()
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
+
+    def on_tab_changed(self, index):
+        """切换标签页时创建尚未创建的标签页内容"""
+        widget = self.tab_widget.widget(index)
+        if widget is self.history_tab:
+            if self.history_table is None:
+                self.setup_history_tab()
+            elif self._history_dirty:
+                self.refresh_history()
+        elif widget is self.clipboard_tab:
+            if self.clipboard_table is None:
+                self.setup_clipboard_history_tab()
+            elif self._clipboard_dirty:
+                self.refresh_clipboard_history()
 
     def setup_main_tab(self):
         """设置主页标签"""
@@ -1146,16 +1736,15 @@ class IPAnalyzer(QMainWindow):
 
         # 标题
         title_label = QLabel(self.config.app_name)
-        title_font = QFont("Microsoft YaHei", 18, QFont.Weight.Bold)
-        title_label.setFont(title_font)
-        title_label.setStyleSheet("color: #2c3e50;")
+        title_label.setFont(self._TITLE_FONT)
+        title_label.setObjectName("titleLabel")
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title_label)
 
         # 分隔线
         line = QWidget()
         line.setFixedHeight(1)
-        line.setStyleSheet("background-color: #ddd;")
+        line.setObjectName("separator")
         layout.addWidget(line)
 
         # API状态显示
@@ -1164,14 +1753,14 @@ class IPAnalyzer(QMainWindow):
         status_layout.setContentsMargins(0, 0, 0, 0)
 
         status_label = QLabel("API状态:")
-        status_label.setFont(QFont("Microsoft YaHei", 10))
+        status_label.setFont(self._LABEL_FONT)
 
         self.status_indicator = QLabel("●")
-        self.status_indicator.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+        self.status_indicator.setFont(self._INDICATOR_FONT)
         self.status_indicator.setStyleSheet("color: #f39c12;")  # 橙色表示检测中
 
         self.api_status_label = QLabel("正在检测...")
-        self.api_status_label.setFont(QFont("Microsoft YaHei", 10))
+        self.api_status_label.setFont(self._LABEL_FONT)
 
         status_layout.addWidget(status_label)
         status_layout.addWidget(self.status_indicator)
@@ -1185,21 +1774,21 @@ class IPAnalyzer(QMainWindow):
         ip_layout.setContentsMargins(0, 0, 0, 0)
 
         ip_title = QLabel("当前IP:")
-        ip_title.setFont(QFont("Microsoft YaHei", 10))
+        ip_title.setFont(self._LABEL_FONT)
 
         self.current_ip_label = QLabel("无")
-        self.current_ip_label.setFont(QFont("Consolas", 10, QFont.Weight.Bold))
+        self.current_ip_label.setFont(self._MONO_FONT)
         self.current_ip_label.setStyleSheet("color: #27ae60;")
 
         self.copy_ip_btn = QPushButton("复制")
         self.copy_ip_btn.clicked.connect(self.copy_current_ip)
         self.copy_ip_btn.setEnabled(False)
-        self.copy_ip_btn.setStyleSheet("padding: 2px 8px; font-size: 11px;")
+        self.copy_ip_btn.setObjectName("smallBtn")
 
         self.view_ip_btn = QPushButton("查看")
         self.view_ip_btn.clicked.connect(self.view_current_ip)
         self.view_ip_btn.setEnabled(False)
-        self.view_ip_btn.setStyleSheet("padding: 2px 8px; font-size: 11px;")
+        self.view_ip_btn.setObjectName("smallBtn")
 
         ip_layout.addWidget(ip_title)
         ip_layout.addWidget(self.current_ip_label)
@@ -1214,21 +1803,14 @@ class IPAnalyzer(QMainWindow):
         detail_layout.setContentsMargins(0, 10, 0, 0)
 
         detail_title = QLabel("IP详情:")
-        detail_title.setFont(QFont("Microsoft YaHei", 10, QFont.Weight.Bold))
+        detail_title.setFont(self._BOLD_LABEL_FONT)
         detail_layout.addWidget(detail_title)
 
         self.ip_detail_text = QTextEdit()
         self.ip_detail_text.setReadOnly(True)
-        self.ip_detail_text.setFont(QFont("Microsoft YaHei", 9))
+        self.ip_detail_text.setFont(self._DETAIL_FONT)
         self.ip_detail_text.setMaximumHeight(100)
-        self.ip_detail_text.setStyleSheet("""
-            QTextEdit {
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                padding: 5px;
-                background-color: #f8f9fa;
-            }
-        """)
+        self.ip_detail_text.setObjectName("infoText")
         detail_layout.addWidget(self.ip_detail_text)
 
         layout.addWidget(detail_widget)
@@ -1239,21 +1821,16 @@ class IPAnalyzer(QMainWindow):
         log_layout.setContentsMargins(0, 10, 0, 0)
 
         log_title = QLabel("最近日志:")
-        log_title.setFont(QFont("Microsoft YaHei", 10, QFont.Weight.Bold))
+        log_title.setFont(self._BOLD_LABEL_FONT)
         log_layout.addWidget(log_title)
 
-        self.log_text = QTextEdit()
+        # 纯文本日志，只保留最近 MAX_LOG_LINES 行，追加不需要重新排版整个文档
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
-        self.log_text.setFont(QFont("Consolas", 9))
+        self.log_text.setMaximumBlockCount(self.MAX_LOG_LINES)
+        self.log_text.setFont(self._LOG_FONT)
         self.log_text.setMaximumHeight(120)
-        self.log_text.setStyleSheet("""
-            QTextEdit {
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                padding: 5px;
-                background-color: #f8f9fa;
-            }
-        """)
+        self.log_text.setObjectName("infoText")
         log_layout.addWidget(self.log_text)
 
         layout.addWidget(log_widget)
@@ -1277,7 +1854,7 @@ class IPAnalyzer(QMainWindow):
 
         self.exit_btn = QPushButton("退出")
         self.exit_btn.clicked.connect(self.close_application)
-        self.exit_btn.setStyleSheet("background-color: #e74c3c; color: white;")
+        self.exit_btn.setObjectName("exitBtn")
 
         button_layout.addWidget(self.settings_btn)
         button_layout.addWidget(self.history_btn)
@@ -1291,8 +1868,7 @@ class IPAnalyzer(QMainWindow):
 
     def setup_history_tab(self):
         """设置历史记录标签"""
-        history_widget = QWidget()
-        layout = QVBoxLayout(history_widget)
+        layout = QVBoxLayout(self.history_tab)
 
         # 控制按钮
         control_widget = QWidget()
@@ -1303,7 +1879,7 @@ class IPAnalyzer(QMainWindow):
 
         self.clear_history_btn = QPushButton("清空")
         self.clear_history_btn.clicked.connect(self.clear_all_history)
-        self.clear_history_btn.setStyleSheet("background-color: #ff4444; color: white;")
+        self.clear_history_btn.setObjectName("dangerBtn")
 
         self.export_history_btn = QPushButton("导出")
         self.export_history_btn.clicked.connect(self.export_history)
@@ -1315,21 +1891,17 @@ class IPAnalyzer(QMainWindow):
 
         layout.addWidget(control_widget)
 
-        # 历史记录表格
-        self.history_table = QTableWidget()
-        self.history_table.setColumnCount(7)
-        self.history_table.setHorizontalHeaderLabels([
-            "时间", "IP地址", "类型", "国家", "省份", "城市", "运营商"
-        ])
+        # 历史记录表格（主窗口不显示操作列）
+        self.history_table = QTableView()
+        self.history_model = HistoryTableModel(self)
+        self.history_table.setModel(self.history_model)
+        self.history_table.setColumnHidden(7, True)
 
-        # 设置表格属性
+        # 设置表格属性（固定初始列宽，避免每次刷新都按内容重新测量）
         header = self.history_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        for column, width in enumerate((150, 180, 50, 80, 80, 80)):
+            header.resizeSection(column, width)
         header.setSectionResizeMode(6, QHeaderView.ResizeMode.Stretch)
 
         self.history_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
@@ -1344,15 +1916,12 @@ class IPAnalyzer(QMainWindow):
 
         layout.addWidget(self.history_table)
 
-        self.tab_widget.addTab(history_widget, "历史记录")
-
         # 加载历史记录
         self.refresh_history()
 
     def setup_clipboard_history_tab(self):
         """设置剪贴板历史记录标签"""
-        clipboard_widget = QWidget()
-        layout = QVBoxLayout(clipboard_widget)
+        layout = QVBoxLayout(self.clipboard_tab)
 
         # 控制按钮
         control_widget = QWidget()
@@ -1363,7 +1932,7 @@ class IPAnalyzer(QMainWindow):
 
         self.clear_clipboard_btn = QPushButton("清空")
         self.clear_clipboard_btn.clicked.connect(self.clear_all_clipboard_history)
-        self.clear_clipboard_btn.setStyleSheet("background-color: #ff4444; color: white;")
+        self.clear_clipboard_btn.setObjectName("dangerBtn")
 
         self.export_clipboard_btn = QPushButton("导出")
         self.export_clipboard_btn.clicked.connect(self.export_clipboard_history)
@@ -1376,18 +1945,22 @@ class IPAnalyzer(QMainWindow):
         layout.addWidget(control_widget)
 
         # 剪贴板历史记录表格
-        self.clipboard_table = QTableWidget()
-        self.clipboard_table.setColumnCount(4)
-        self.clipboard_table.setHorizontalHeaderLabels([
-            "时间", "剪贴板内容", "包含IP", "操作"
-        ])
+        self.clipboard_table = QTableView()
+        self.clipboard_model = ClipboardTableModel(self)
+        self.clipboard_table.setModel(self.clipboard_model)
+
+        # 操作列由委托绘制按钮
+        self.clipboard_button_delegate = ButtonDelegate(["查看", "复制"], self.clipboard_table)
+        self.clipboard_button_delegate.clicked.connect(self.on_clipboard_button_clicked)
+        self.clipboard_table.setItemDelegateForColumn(3, self.clipboard_button_delegate)
 
-        # 设置表格属性
+        # 设置表格属性（固定初始列宽，避免每次刷新都按内容重新测量）
         header = self.clipboard_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.resizeSection(0, 150)
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
+        header.resizeSection(2, 60)
+        header.resizeSection(3, 110)
 
         self.clipboard_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.clipboard_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
@@ -1401,8 +1974,6 @@ class IPAnalyzer(QMainWindow):
 
         layout.addWidget(self.clipboard_table)
 
-        self.tab_widget.addTab(clipboard_widget, "剪贴板历史")
-
         # 加载剪贴板历史记录
         self.refresh_clipboard_history()
 
@@ -1413,7 +1984,7 @@ class IPAnalyzer(QMainWindow):
             menu = QMenu()
 
             # 获取选中行的IP地址
-            ip = self.history_table.item(row, 1).text()
+            ip = self.history_model.record(row)["ip"]
 
             # 添加菜单项
             copy_action = QAction("复制IP地址", self)
@@ -1438,8 +2009,7 @@ class IPAnalyzer(QMainWindow):
             menu = QMenu()
 
             # 获取选中行的内容
-            content_item = self.clipboard_table.item(row, 1)
-            content = content_item.toolTip() if content_item.toolTip() else content_item.text()
+            content = self.clipboard_row_content(row)
 
             # 添加菜单项
             copy_action = QAction("复制内容", self)
@@ -1457,53 +2027,46 @@ class IPAnalyzer(QMainWindow):
 
             menu.exec(self.clipboard_table.viewport().mapToGlobal(position))
 
+    def clipboard_row_content(self, row):
+        """获取剪贴板表格指定行的完整内容"""
+        return self.clipboard_model.record(row)["content"]
+
+    def on_clipboard_button_clicked(self, row, button):
+        """剪贴板表格操作列按钮点击"""
+        content = self.clipboard_row_content(row)
+        if button == 0:
+            self.view_clipboard_content(content)
+        else:
+            self.copy_clipboard_content(content)
+
     def on_history_double_click(self, index):
         """历史记录表格双击事件"""
         row = index.row()
         if row >= 0:
-            # 获取该行所有数据
-            time_str = self.history_table.item(row, 0).text()
-            ip = self.history_table.item(row, 1).text()
-            ip_type = self.history_table.item(row, 2).text()
-            country = self.history_table.item(row, 3).text()
-            province = self.history_table.item(row, 4).text()
-            city = self.history_table.item(row, 5).text()
-            isp = self.history_table.item(row, 6).text()
-
-            # 构建详细内容
-            details = f"查询时间: {time_str}\n"
-            details += f"IP地址: {ip}\n"
-            details += f"IP类型: {ip_type}\n"
-            details += f"地理位置: {country} - {province} - {city}\n"
-            details += f"网络运营商: {isp}\n"
-
-            # 显示对话框
-            dialog = DetailDialog(f"IP详情 - {ip}", details, self)
-            dialog.exec()
+            ip = self.history_model.record(row)["ip"]
+            show_detail_dialog(self, f"IP详情 - {ip}", self.history_model.details(row))
 
     def on_clipboard_double_click(self, index):
         """剪贴板表格双击事件"""
         row = index.row()
         if row >= 0:
             # 获取该行所有数据
-            time_str = self.clipboard_table.item(row, 0).text()
-            content_item = self.clipboard_table.item(row, 1)
-            content = content_item.toolTip() if content_item.toolTip() else content_item.text()
-            contains_ip = self.clipboard_table.item(row, 2).text()
+            time_str = self.clipboard_model.index(row, 0).data()
+            content = self.clipboard_row_content(row)
+            contains_ip = self.clipboard_model.index(row, 2).data()
 
             # 构建详细内容
             details = f"记录时间: {time_str}\n"
             details += f"包含IP: {contains_ip}\n"
             details += f"内容长度: {len(content)} 字符\n"
-            details += f"\n完整内容:\n{'-' * 40}\n{content}\n{'-' * 40}"
+            details += f"\n完整内容:\n{'-' * 40}\n{truncate_for_display(content)}\n{'-' * 40}"
 
             # 显示对话框
-            dialog = DetailDialog("剪贴板内容详情", details, self)
-            dialog.exec()
+            show_detail_dialog(self, "剪贴板内容详情", details)
 
     def copy_ip_from_table(self, ip):
         """从表格复制IP"""
-        pyperclip.copy(ip)
+        QApplication.clipboard().setText(ip)
         self.add_log(f"已复制IP地址: {ip}", "success")
 
     def view_ip_from_table(self, ip):
@@ -1512,8 +2075,9 @@ class IPAnalyzer(QMainWindow):
 
     def delete_history_record(self, row):
         """删除历史记录"""
-        ip = self.history_table.item(row, 1).text()
-        time_str = self.history_table.item(row, 0).text()
+        record = self.history_model.record(row)
+        ip = record["ip"]
+        time_str = record["time"]
 
         reply = QMessageBox.question(
             self, "确认删除",
@@ -1532,18 +2096,17 @@ class IPAnalyzer(QMainWindow):
 
     def copy_clipboard_content(self, content):
         """复制剪贴板内容"""
-        pyperclip.copy(content)
+        QApplication.clipboard().setText(content)
         self.add_log("已复制内容到剪贴板", "success")
 
     def view_clipboard_content(self, content):
         """查看剪贴板内容"""
-        dialog = DetailDialog("剪贴板内容详情", content, self)
-        dialog.exec()
+        show_detail_dialog(self, "剪贴板内容详情", truncate_for_display(content))
 
     def delete_clipboard_record(self, row):
         """删除剪贴板记录"""
-        time_str = self.clipboard_table.item(row, 0).text()
-        content_preview = self.clipboard_table.item(row, 1).text()
+        time_str = self.clipboard_model.index(row, 0).data()
+        content_preview = self.clipboard_model.index(row, 1).data()
 
         reply = QMessageBox.question(
             self, "确认删除",
@@ -1560,8 +2123,12 @@ class IPAnalyzer(QMainWindow):
             else:
                 self.add_log("删除剪贴板记录失败", "error")
 
-    def create_app_icon(self):
-        """创建应用程序图标"""
+    @staticmethod
+    def create_app_icon():
+        """创建应用程序图标（只绘制一次，之后返回缓存）"""
+        if IPAnalyzer._APP_ICON is not None:
+            return IPAnalyzer._APP_ICON
+
         pixmap = QPixmap(64, 64)
         pixmap.fill(Qt.GlobalColor.transparent)
 
@@ -1583,7 +2150,40 @@ class IPAnalyzer(QMainWindow):
         painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, "IP")
 
         painter.end()
-        return QIcon(pixmap)
+        IPAnalyzer._APP_ICON = QIcon(pixmap)
+        return IPAnalyzer._APP_ICON
+
+    def _build_tray_menu(self):
+        """创建托盘菜单（只创建一次），菜单项以菜单为父对象"""
+        if self._tray_menu is not None:
+            return self._tray_menu
+
+        menu = QMenu(self)
+        # (文字, 槽函数)，None 为分隔线
+        entries = [
+            ("显示主窗口", self.show_window),
+            ("查看历史记录", self.show_history_window),
+            ("查看剪贴板记录", self.show_clipboard_history_window),
+            None,
+            ("手动检测剪贴板", self.manual_check),
+            ("测试API连接", self.test_api_connection),
+            None,
+            ("设置", self.show_settings),
+            ("关于", self.show_about),
+            None,
+            ("退出", self.close_application),
+        ]
+        for entry in entries:
+            if entry is None:
+                menu.addSeparator()
+                continue
+            text, slot = entry
+            action = QAction(text, menu)
+            action.triggered.connect(slot)
+            menu.addAction(action)
+
+        self._tray_menu = menu
+        return menu
 
     def setup_tray(self):
         """设置系统托盘"""
@@ -1592,56 +2192,8 @@ class IPAnalyzer(QMainWindow):
             icon = self.create_app_icon()
             self.tray_icon.setIcon(icon)
 
-            # 创建托盘菜单
-            tray_menu = QMenu()
-
-            # 显示窗口
-            show_action = QAction("显示主窗口", self)
-            show_action.triggered.connect(self.show_window)
-            tray_menu.addAction(show_action)
-
-            # 查看历史
-            history_action = QAction("查看历史记录", self)
-            history_action.triggered.connect(self.show_history_window)
-            tray_menu.addAction(history_action)
-
-            # 查看剪贴板历史
-            clipboard_history_action = QAction("查看剪贴板记录", self)
-            clipboard_history_action.triggered.connect(self.show_clipboard_history_window)
-            tray_menu.addAction(clipboard_history_action)
-
-            tray_menu.addSeparator()
-
-            # 手动检测
-            check_action = QAction("手动检测剪贴板", self)
-            check_action.triggered.connect(self.manual_check)
-            tray_menu.addAction(check_action)
-
-            # 测试API
-            test_api_action = QAction("测试API连接", self)
-            test_api_action.triggered.connect(self.test_api_connection)
-            tray_menu.addAction(test_api_action)
-
-            tray_menu.addSeparator()
-
-            # 设置
-            settings_action = QAction("设置", self)
-            settings_action.triggered.connect(self.show_settings)
-            tray_menu.addAction(settings_action)
-
-            # 关于
-            about_action = QAction("关于", self)
-            about_action.triggered.connect(self.show_about)
-            tray_menu.addAction(about_action)
-
-            tray_menu.addSeparator()
-
-            # 退出
-            exit_action = QAction("退出", self)
-            exit_action.triggered.connect(self.close_application)
-            tray_menu.addAction(exit_action)
-
-            self.tray_icon.setContextMenu(tray_menu)
+            # 托盘菜单
+            self.tray_icon.setContextMenu(self._build_tray_menu())
 
             # 托盘图标提示
             self.tray_icon.setToolTip(f"{self.config.app_name}\nIP地理分析工具")
@@ -1667,8 +2219,10 @@ class IPAnalyzer(QMainWindow):
 
     def start_api_checker(self):
         """启动API检查器"""
-        self.api_checker = APIChecker()
+        self.api_checker = APIChecker(self.config)
         self.api_checker.status_updated.connect(self.update_api_status)
+        self.api_checker.update_available.connect(self.on_update_available)
+        self.api_checker.check_completed.connect(self.on_update_check_completed)
         self.api_checker.start()
 
     def update_api_status(self, status, message):
@@ -1677,67 +2231,83 @@ class IPAnalyzer(QMainWindow):
         self.config.api_status = status
 
         def update_ui():
-            if status == "connected":
-                self.status_indicator.setStyleSheet("color: #27ae60;")
-                self.api_status_label.setStyleSheet("color: #27ae60;")
-            else:
-                self.status_indicator.setStyleSheet("color: #e74c3c;")
-                self.api_status_label.setStyleSheet("color: #e74c3c;")
+            if (status, message) == self._last_status:
+                return
+            last_status, last_message = self._last_status or (None, None)
+            self._last_status = (status, message)
 
-            self.api_status_label.setText(message)
+            # 状态变化时才重新设置样式表，并记录日志
+            if status != last_status:
+                color = "#27ae60" if status == "connected" else "#e74c3c"
+                self.status_indicator.setStyleSheet(f"color: {color};")
+                self.api_status_label.setStyleSheet(f"color: {color};")
 
-            # 只记录状态变化的日志
-            if hasattr(self, 'last_api_status') and self.last_api_status != status:
-                self.add_log(f"API状态: {message}",
-                             "success" if status == "connected" else "error")
+                if last_status is not None:
+                    self.add_log(f"API状态: {message}",
+                                 "success" if status == "connected" else "error")
 
-            self.last_api_status = status
+            if message != last_message:
+                self.api_status_label.setText(message)
 
         QTimer.singleShot(0, update_ui)
 
     def start_clipboard_monitor(self):
         """启动剪贴板监控"""
-        self.clipboard_timer = QTimer()
-        self.clipboard_timer.timeout.connect(self.check_clipboard)
-        self.clipboard_timer.start(int(self.config.check_interval * 1000))
-        self.add_log(f"剪贴板监控已启动，间隔: {self.config.check_interval}秒", "info")
+        self.clipboard_scanner = ClipboardScanner(self)
+        self.clipboard_scanner.scanned.connect(self.on_clipboard_scanned)
+        self.clipboard_scanner.scan_failed.connect(self.on_clipboard_scan_failed)
+        self.clipboard_scanner.start()
+
+        # 由系统在剪贴板内容变化时通知，无需定时轮询
+        QApplication.clipboard().dataChanged.connect(self.check_clipboard)
+        # 启动时剪贴板中已有的内容也检查一次
+        QTimer.singleShot(0, self.check_clipboard)
+        self.add_log("剪贴板监控已启动", "info")
 
     def check_clipboard(self):
         """检查剪贴板内容"""
         try:
-            clipboard_content = pyperclip.paste().strip()
+            # 先比较原始文本，未变化时不必生成 strip 后的副本
+            raw_content = QApplication.clipboard().text()
+            if raw_content == self._last_clipboard_raw:
+                return
+            self._last_clipboard_raw = raw_content
 
+            clipboard_content = raw_content.strip()
             if not clipboard_content or clipboard_content == self.last_clipboard_content:
                 return
 
-            # 保存剪贴板历史
-            contains_ip = len(self.extract_ips_from_text(clipboard_content)) > 0
-            self.db_manager.add_clipboard_record(clipboard_content, contains_ip)
+            self.last_clipboard_content = clipboard_content
 
-            # 如果剪贴板历史标签页是当前页，刷新显示
-            if self.tab_widget.currentIndex() == 2:  # 剪贴板历史标签页
-                self.refresh_clipboard_history()
+            # 提取IP和保存剪贴板历史在后台线程完成，结果通过 on_clipboard_scanned 返回
+            self.clipboard_scanner.submit(clipboard_content)
 
-            self.last_clipboard_content = clipboard_content
+        except Exception as e:
+            self.add_log(f"剪贴板监控错误: {str(e)}", "error")
+
+    def on_clipboard_scan_failed(self, error):
+        """后台扫描出错时写入日志"""
+        self.add_log(f"剪贴板监控错误: {error}", "error")
 
-            # 从文本中提取IP地址
-            ips_found = self.extract_ips_from_text(clipboard_content)
-
-            if ips_found:
-                for ip, ip_type in ips_found:
-                    if ip != self.current_ip:
-                        self.current_ip = ip
-                        self.update_current_ip_display(ip)
-                        self.add_log(f"检测到{ip_type.upper()}: {ip}", "info")
-
-                        # 查询IP信息
-                        threading.Thread(
-                            target=self.query_ip_info,
-                            args=(ip, ip_type),
-                            daemon=True
-                        ).start()
-                        break
+    def on_clipboard_scanned(self, clipboard_content, contains_ip, new_ip):
+        """处理后台扫描结果"""
+        try:
+            # 如果剪贴板历史标签页是当前页，刷新显示
+            if self.tab_widget.currentIndex() == 2:  # 剪贴板历史标签页
+                self.schedule_clipboard_refresh()
             else:
+                self._clipboard_dirty = True
+
+            if new_ip is not None:
+                ip, ip_type = new_ip
+                if ip != self.current_ip:
+                    self.current_ip = ip
+                    self.update_current_ip_display(ip)
+                    self.add_log(f"检测到{ip_type.upper()}: {ip}", "info")
+
+                    # 查询IP信息
+                    QThreadPool.globalInstance().start(partial(self.query_ip_info, ip, ip_type))
+            elif not contains_ip:
                 self.update_current_ip_display(None)
 
         except Exception as e:
@@ -1745,126 +2315,27 @@ class IPAnalyzer(QMainWindow):
 
     def extract_ips_from_text(self, text: str) -> List[Tuple[str, str]]:
         """从文本中提取IP地址"""
-        ips_found = []
-
-        # 改进的IPv4正则表达式 - 支持中文字符前后的IP
-        ipv4_pattern = r'(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)'
-
-        # 改进的IPv6正则表达式
-        ipv6_pattern = r'(?:[A-Fa-f0-9]{1,4}:){7}[A-Fa-f0-9]{1,4}|' \
-                       r'(?:[A-Fa-f0-9]{1,4}:){1,6}:(?:[A-Fa-f0-9]{1,4}:){0,5}[A-Fa-f0-9]{1,4}|' \
-                       r'[A-Fa-f0-9]{1,4}::(?:[A-Fa-f0-9]{1,4}:){0,5}[A-Fa-f0-9]{1,4}|' \
-                       r'::(?:[A-Fa-f0-9]{1,4}:){0,6}[A-Fa-f0-9]{1,4}|' \
-                       r'(?:[A-Fa-f0-9]{1,4}:){1,7}:'
-
-        # 查找IPv4
-        if self.config.enable_ipv4:
-            ipv4_matches = re.finditer(ipv4_pattern, text)
-            for match in ipv4_matches:
-                ip = match.group()
-                # 验证并确保不是部分匹配（如1.2.3.4.5中的1.2.3.4）
-                if self.is_valid_ipv4(ip):
-                    # 检查前后字符，确保不是更大的数字的一部分
-                    start_pos, end_pos = match.span()
-                    if start_pos > 0 and text[start_pos - 1].isdigit():
-                        continue  # 前一个字符是数字，可能是更大的数字的一部分
-                    if end_pos < len(text) and text[end_pos].isdigit():
-                        continue  # 后一个字符是数字，可能是更大的数字的一部分
-
-                    ips_found.append((ip, "ipv4"))
-
-        # 查找IPv6
-        if self.config.enable_ipv6:
-            ipv6_matches = re.finditer(ipv6_pattern, text, re.IGNORECASE)
-            for match in ipv6_matches:
-                ip = match.group()
-                if self.is_valid_ipv6(ip):
-                    ips_found.append((ip, "ipv6"))
-
-        return ips_found
-
-    def is_valid_ipv4(self, ip: str) -> bool:
-        """验证IPv4地址有效性"""
-        try:
-            # 确保不是部分匹配
-            if re.match(r'^\d+$', ip):  # 纯数字不是IP
-                return False
-
-            parts = ip.split('.')
-            if len(parts) != 4:
-                return False
-
-            for part in parts:
-                # 检查是否为空
-                if not part:
-                    return False
-
-                # 检查是否为数字
-                if not part.isdigit():
-                    return False
+        return list(self.iter_ips_from_text(text))
 
-                num = int(part)
-                if num < 0 or num > 255:
-                    return False
+    def find_first_ip(self, text: str, exclude: Optional[str] = None) -> Tuple[bool, Optional[Tuple[str, str]]]:
+        """查找第一个不等于 exclude 的IP，找到即停止扫描
 
-                # 检查前导零
-                if len(part) > 1 and part.startswith('0'):
-                    return False
+        返回 (文本是否包含IP, (ip, 类型) 或 None)
+        """
+        contains_ip = False
+        for ip, ip_type in self.iter_ips_from_text(text):
+            contains_ip = True
+            if ip != exclude:
+                return contains_ip, (ip, ip_type)
+        return contains_ip, None
 
-            return True
-        except:
-            return False
+    def iter_ips_from_text(self, text: str) -> Iterator[Tuple[str, str]]:
+        """按当前设置逐个产出文本中的IP地址，调用方可提前停止"""
+        return iter_ips(text, self.config.enable_ipv4, self.config.enable_ipv6)
 
     def is_valid_ipv6(self, ip: str) -> bool:
         """验证IPv6地址有效性"""
-        try:
-            # 排除单独的 "::" 或 ":::" 等无效格式
-            if ip == "::" or ip == ":::":
-                return False
-
-            if ':::' in ip:
-                return False
-
-            if ip.count('::') > 1:
-                return False
-
-            # 分割成各个部分
-            if '::' in ip:
-                # 处理双冒号缩写
-                parts = ip.split(':')
-                if ip.startswith('::'):
-                    parts = parts[1:]
-                if ip.endswith('::'):
-                    parts = parts[:-1]
-
-                # 计算应有部分数量
-                double_colon_parts = 8 - len([p for p in parts if p])
-
-                # 确保总部分数不超过8
-                if len([p for p in parts if p]) + double_colon_parts > 8:
-                    return False
-            else:
-                # 标准格式
-                parts = ip.split(':')
-                if len(parts) != 8:
-                    return False
-
-            # 验证每个部分（如果有）
-            for part in ip.split(':'):
-                if part:
-                    # 部分长度1-4个十六进制字符
-                    if len(part) > 4:
-                        return False
-
-                    # 验证十六进制
-                    try:
-                        int(part, 16)
-                    except ValueError:
-                        return False
-
-            return True
-        except:
-            return False
+        return is_valid_ipv6(ip)
 
     def update_current_ip_display(self, ip: Optional[str]):
         """更新当前IP显示"""
@@ -1887,7 +2358,7 @@ class IPAnalyzer(QMainWindow):
     def copy_current_ip(self):
         """复制当前IP"""
         if self.current_ip:
-            pyperclip.copy(self.current_ip)
+            QApplication.clipboard().setText(self.current_ip)
             self.add_log(f"已复制IP: {self.current_ip}", "success")
 
     def view_current_ip(self):
@@ -1895,6 +2366,20 @@ class IPAnalyzer(QMainWindow):
         if self.current_ip:
             webbrowser.open(f"https://ipv4.ink/{self.current_ip}")
 
+    def get_http_session(self):
+        """返回共享的requests会话（keep-alive），各查询之间复用连接"""
+        with self._http_lock:
+            if self._http_session is None:
+                import requests
+
+                session = requests.Session()
+                session.headers.update({"User-Agent": "IPAnalyzer/1.0"})
+                adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._http_session = session
+            return self._http_session
+
     def query_ip_info(self, ip, ip_type):
         """查询IP信息"""
         try:
@@ -1903,7 +2388,7 @@ class IPAnalyzer(QMainWindow):
             else:
                 url = f"{self.config.api_base_url}/ipv6?ip={ip}"
 
-            response = requests.get(url, timeout=10)
+            response = self.get_http_session().get(url, timeout=10)
             data = response.json()
 
             if response.status_code == 200:
@@ -1922,9 +2407,8 @@ class IPAnalyzer(QMainWindow):
         """保存到历史记录"""
         try:
             self.db_manager.add_record(ip, ip_type, data)
-            # 如果历史记录标签页是当前页，刷新显示
-            if self.tab_widget.currentIndex() == 1:  # 历史记录标签页
-                self.refresh_history()
+            # 在界面线程中刷新历史记录表格
+            self.history_saved.emit()
         except Exception as e:
             self.add_log(f"保存历史记录失败: {str(e)}", "error")
 
@@ -1991,20 +2475,17 @@ class IPAnalyzer(QMainWindow):
 
     def add_log(self, message: str, log_type: str = "info"):
         """添加日志"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        # 时间戳精确到秒，同一秒内复用已格式化的字符串
+        now = int(time.time())
+        second, timestamp = self._log_timestamp
+        if now != second:
+            timestamp = time.strftime("%H:%M:%S", time.localtime(now))
+            self._log_timestamp = (now, timestamp)
 
-        colors = {
-            "info": "#3498db",
-            "success": "#27ae60",
-            "warning": "#f39c12",
-            "error": "#e74c3c",
-        }
-
-        color = colors.get(log_type, "#3498db")
         log_message = f'[{timestamp}] {message}'
 
         def update_log():
-            self.log_text.append(log_message)
+            self.log_text.appendPlainText(log_message)
             scrollbar = self.log_text.verticalScrollBar()
             scrollbar.setValue(scrollbar.maximum())
 
@@ -2015,89 +2496,61 @@ class IPAnalyzer(QMainWindow):
         settings_window = SettingsWindow(self.config, self)
         if settings_window.exec():
             self.add_log("设置已保存", "success")
-            # 重启剪贴板监控
-            self.clipboard_timer.stop()
-            self.start_clipboard_monitor()
 
     def show_history_window(self):
         """显示历史记录窗口"""
-        history_window = HistoryWindow(self.db_manager, self)
-        history_window.exec()
+        if self._history_window is None:
+            self._history_window = HistoryWindow(self.db_manager, self)
+        else:
+            # 主窗口可能已删除或清空记录，重新加载第一页
+            self._history_window.load_history()
+        self._history_window.exec()
 
     def show_clipboard_history_window(self):
         """显示剪贴板历史记录窗口"""
-        clipboard_window = ClipboardHistoryWindow(self.db_manager, self)
-        clipboard_window.exec()
+        if self._clipboard_history_window is None:
+            self._clipboard_history_window = ClipboardHistoryWindow(self.db_manager, self)
+        else:
+            self._clipboard_history_window.load_clipboard_history()
+        self._clipboard_history_window.exec()
+
+    def on_history_saved(self):
+        """新记录写入后，如果历史记录标签页是当前页，刷新显示；否则等切换过去时再刷新"""
+        if self.tab_widget.currentIndex() == 1:  # 历史记录标签页
+            self.schedule_history_refresh()
+        else:
+            self._history_dirty = True
+
+    def schedule_history_refresh(self):
+        """请求刷新历史记录，REFRESH_DELAY_MS 内的多次请求合并为一次"""
+        if not self._history_refresh_timer.isActive():
+            self._history_refresh_timer.start()
+
+    def schedule_clipboard_refresh(self):
+        """请求刷新剪贴板历史记录，REFRESH_DELAY_MS 内的多次请求合并为一次"""
+        if not self._clipboard_refresh_timer.isActive():
+            self._clipboard_refresh_timer.start()
 
     def refresh_history(self):
         """刷新历史记录"""
+        if self.history_table is None:
+            return  # 标签页尚未创建，切换到时再加载
         try:
             history = self.db_manager.get_history()
-            self.history_table.setRowCount(len(history))
-
-            for row, record in enumerate(history):
-                # 时间
-                self.history_table.setItem(row, 0, QTableWidgetItem(record[1]))
-                # IP地址
-                self.history_table.setItem(row, 1, QTableWidgetItem(record[2]))
-                # IP类型
-                self.history_table.setItem(row, 2, QTableWidgetItem(record[3]))
-                # 国家
-                self.history_table.setItem(row, 3, QTableWidgetItem(record[4] if record[4] else "未知"))
-                # 省份
-                self.history_table.setItem(row, 4, QTableWidgetItem(record[5] if record[5] else "未知"))
-                # 城市
-                self.history_table.setItem(row, 5, QTableWidgetItem(record[6] if record[6] else "未知"))
-                # 运营商
-                self.history_table.setItem(row, 6, QTableWidgetItem(record[7] if record[7] else "未知"))
-
+            self.history_model.set_rows(history)
+            self._history_dirty = False
             self.add_log(f"历史记录已刷新，共 {len(history)} 条记录", "success")
         except Exception as e:
             self.add_log(f"刷新历史记录失败: {str(e)}", "error")
 
     def refresh_clipboard_history(self):
         """刷新剪贴板历史记录"""
+        if self.clipboard_table is None:
+            return  # 标签页尚未创建，切换到时再加载
         try:
             history = self.db_manager.get_clipboard_history()
-            self.clipboard_table.setRowCount(len(history))
-
-            for row, record in enumerate(history):
-                # 时间
-                self.clipboard_table.setItem(row, 0, QTableWidgetItem(record[1]))
-
-                # 剪贴板内容
-                content = record[2]
-                # 截断长内容
-                if len(content) > 100:
-                    display_content = content[:100] + "..."
-                else:
-                    display_content = content
-                content_item = QTableWidgetItem(display_content)
-                content_item.setToolTip(content)  # 鼠标悬停显示完整内容
-                self.clipboard_table.setItem(row, 1, content_item)
-
-                # 包含IP
-                contains_ip = record[3]
-                ip_item = QTableWidgetItem("是" if contains_ip else "否")
-                self.clipboard_table.setItem(row, 2, ip_item)
-
-                # 操作按钮
-                btn_widget = QWidget()
-                btn_layout = QHBoxLayout(btn_widget)
-                btn_layout.setContentsMargins(0, 0, 0, 0)
-
-                copy_btn = QPushButton("复制")
-                copy_btn.clicked.connect(lambda checked, content=content: self.copy_clipboard_content(content))
-                copy_btn.setStyleSheet("padding: 2px 5px; font-size: 12px;")
-
-                view_btn = QPushButton("查看")
-                view_btn.clicked.connect(lambda checked, content=content: self.view_clipboard_content(content))
-                view_btn.setStyleSheet("padding: 2px 5px; font-size: 12px;")
-
-                btn_layout.addWidget(view_btn)
-                btn_layout.addWidget(copy_btn)
-                self.clipboard_table.setCellWidget(row, 3, btn_widget)
-
+            self.clipboard_model.set_rows(history)
+            self._clipboard_dirty = False
             self.add_log(f"剪贴板历史记录已刷新，共 {len(history)} 条记录", "success")
         except Exception as e:
             self.add_log(f"刷新剪贴板历史记录失败: {str(e)}", "error")
@@ -2160,51 +2613,24 @@ class IPAnalyzer(QMainWindow):
             if not file_path:
                 return  # 用户取消
 
-            history = self.db_manager.get_history(limit=1000)
-
-            if file_path.endswith('.csv'):
-                # 导出为CSV
-                import csv
-                with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['时间', 'IP地址', '类型', '国家', '省份', '城市', '运营商', '查询耗时(ms)'])
-
-                    for record in history:
-                        writer.writerow([
-                            record[1],  # 时间
-                            record[2],  # IP地址
-                            record[3],  # 类型
-                            record[4] if record[4] else "未知",  # 国家
-                            record[5] if record[5] else "未知",  # 省份
-                            record[6] if record[6] else "未知",  # 城市
-                            record[7] if record[7] else "未知",  # 运营商
-                            record[8] if record[8] else ""  # 查询耗时
-                        ])
-            else:
-                # 导出为JSON
-                export_data = []
-
-                for record in history:
-                    export_data.append({
-                        "time": record[1],
-                        "ip": record[2],
-                        "type": record[3],
-                        "country": record[4],
-                        "province": record[5],
-                        "city": record[6],
-                        "isp": record[7],
-                        "query_time": record[8]
-                    })
-
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(export_data, f, indent=2, ensure_ascii=False)
-
-            QMessageBox.information(self, "导出成功", f"历史记录已导出到:\n{file_path}")
-            self.add_log(f"历史记录已导出到: {file_path}", "success")
+            # 在后台线程中逐条读取并写入，内存占用与记录总数无关
+            self.export_worker = start_export(
+                self, self.export_history_btn, self.db_manager.iter_history(), file_path,
+                HISTORY_EXPORT_FORMAT, self.on_history_export_finished
+            )
         except Exception as e:
             QMessageBox.critical(self, "导出失败", f"导出失败: {str(e)}")
             self.add_log(f"导出失败: {str(e)}", "error")
 
+    def on_history_export_finished(self, success, message):
+        """历史记录导出完成"""
+        if success:
+            QMessageBox.information(self, "导出成功", f"历史记录已导出到:\n{message}")
+            self.add_log(f"历史记录已导出到: {message}", "success")
+        else:
+            QMessageBox.critical(self, "导出失败", f"导出失败: {message}")
+            self.add_log(f"导出失败: {message}", "error")
+
     def export_clipboard_history(self):
         """导出剪贴板历史记录"""
         try:
@@ -2221,41 +2647,24 @@ class IPAnalyzer(QMainWindow):
             if not file_path:
                 return  # 用户取消
 
-            history = self.db_manager.get_clipboard_history(limit=1000)
-
-            if file_path.endswith('.csv'):
-                # 导出为CSV
-                import csv
-                with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['时间', '内容', '包含IP'])
-
-                    for record in history:
-                        writer.writerow([
-                            record[1],  # 时间
-                            record[2],  # 内容
-                            "是" if record[3] else "否"  # 包含IP
-                        ])
-            else:
-                # 导出为JSON
-                export_data = []
-
-                for record in history:
-                    export_data.append({
-                        "time": record[1],
-                        "content": record[2],
-                        "contains_ip": bool(record[3])
-                    })
-
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(export_data, f, indent=2, ensure_ascii=False)
-
-            QMessageBox.information(self, "导出成功", f"剪贴板历史记录已导出到:\n{file_path}")
-            self.add_log(f"剪贴板历史记录已导出到: {file_path}", "success")
+            # 在后台线程中逐条读取并写入，内存占用与记录总数无关
+            self.export_worker = start_export(
+                self, self.export_clipboard_btn, self.db_manager.iter_clipboard_history(), file_path,
+                CLIPBOARD_EXPORT_FORMAT, self.on_clipboard_export_finished
+            )
         except Exception as e:
             QMessageBox.critical(self, "导出失败", f"导出失败: {str(e)}")
             self.add_log(f"导出失败: {str(e)}", "error")
 
+    def on_clipboard_export_finished(self, success, message):
+        """剪贴板历史记录导出完成"""
+        if success:
+            QMessageBox.information(self, "导出成功", f"剪贴板历史记录已导出到:\n{message}")
+            self.add_log(f"剪贴板历史记录已导出到: {message}", "success")
+        else:
+            QMessageBox.critical(self, "导出失败", f"导出失败: {message}")
+            self.add_log(f"导出失败: {message}", "error")
+
     # 添加检查更新方法到 IPAnalyzer 类
     def check_for_updates(self, silent=False):
         """检查更新"""
@@ -2267,10 +2676,8 @@ class IPAnalyzer(QMainWindow):
             if silent:
                 self._update_silent = True
 
-            self.update_checker = UpdateChecker(self.config)
-            self.update_checker.update_available.connect(self.on_update_available)
-            self.update_checker.check_completed.connect(self.on_update_check_completed)
-            self.update_checker.start()
+            # 在后台网络线程中执行，手动检查时忽略缓存
+            self.api_checker.request_update_check(force=not silent)
 
         except Exception as e:
             if not silent:
@@ -2288,8 +2695,7 @@ class IPAnalyzer(QMainWindow):
                     changelog = update_info.get('changelog', '暂无更新说明')
 
                     # 记录最后检查时间
-                    self.config.last_update_check = datetime.now().isoformat()
-                    self.config.save_config()
+                    self.config.update_config(last_update_check=datetime.now().isoformat())
 
                     # 显示更新对话框
                     message = f"发现新版本: v{remote_version}\n\n"
@@ -2346,7 +2752,7 @@ class IPAnalyzer(QMainWindow):
 
         def test():
             try:
-                response = requests.get(f"{self.config.api_base_url}/", timeout=5)
+                response = self.get_http_session().get(f"{self.config.api_base_url}/", timeout=5)
                 if response.status_code == 200:
                     self.api_checker.status_updated.emit("connected", "API连接正常")
                 else:
@@ -2354,7 +2760,7 @@ class IPAnalyzer(QMainWindow):
             except Exception as e:
                 self.api_checker.status_updated.emit("disconnected", f"连接错误: {str(e)}")
 
-        threading.Thread(target=test, daemon=True).start()
+        QThreadPool.globalInstance().start(test)
 
     def show_about(self):
         """显示关于对话框"""
@@ -2417,9 +2823,15 @@ class IPAnalyzer(QMainWindow):
             self.api_checker.stop()
             self.api_checker.wait()
 
+        if hasattr(self, 'clipboard_scanner'):
+            self.clipboard_scanner.stop()
+            self.clipboard_scanner.wait()
+
         if hasattr(self, 'tray_icon'):
             self.tray_icon.hide()
 
+        self.db_manager.close()
+
         QApplication.quit()
 
     def closeEvent(self, event):
@@ -2429,6 +2841,11 @@ class IPAnalyzer(QMainWindow):
 
 
 def main():
+    # --verbose: 在控制台输出通知等调试日志
+    if "--verbose" in sys.argv:
+        logging.basicConfig(format="%(asctime)s %(name)s %(levelname)s: %(message)s")
+        logging.getLogger("ipanalyzer").setLevel(logging.DEBUG)
+
     app = QApplication(sys.argv)
     app.setApplicationName("Mingxin")
     app.setApplicationDisplayName("ipv4.ink")
@@ -0,0 +1,35 @@
+"""IP提取的回归测试：结果须与分别用IPv4、IPv6正则扫描两遍的旧实现一致"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from main import iter_ips
+
+
+class IterIpsTest(unittest.TestCase):
+
+    def test_ipv6_scan_independent_of_ipv4_matches(self):
+        # IPv4 候选不能吞掉IPv6匹配的起点
+        self.assertEqual(list(iter_ips('::092.1.2.92.11::9')),
+                         [('::092', 'ipv6'), ('11::9', 'ipv6')])
+        self.assertEqual(list(iter_ips(':202::9101.2.2.9.19999::')),
+                         [('202::9101', 'ipv6'), ('9999::', 'ipv6')])
+
+    def test_ipv4_inside_ipv6_match(self):
+        self.assertEqual(list(iter_ips('::ffff:192.168.1.1')),
+                         [('192.168.1.1', 'ipv4'), ('::ffff:192', 'ipv6')])
+        self.assertEqual(list(iter_ips('cafe::beef:1.2.3.4', enable_ipv6=False)),
+                         [('1.2.3.4', 'ipv4')])
+
+    def test_ipv4_before_ipv6(self):
+        self.assertEqual(list(iter_ips('fe80::1 和 8.8.8.8')),
+                         [('8.8.8.8', 'ipv4'), ('fe80::1', 'ipv6')])
+
+    def test_rejects_leading_zero_and_longer_numbers(self):
+        self.assertEqual(list(iter_ips('01.2.3.4 1.2.3.256 1234.1.1.1')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()